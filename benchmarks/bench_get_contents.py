@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Recipe's get_contents()
+
+Loads get_contents() and its role table straight from
+bloomberg_filtered.recipe (without importing calibre) and times it against
+the original recursive renderer kept below as the reference. Output parity
+is checked by tests/test_recipe_get_contents.py, which reuses the reference
+and payloads defined here.
+
+Payloads:
+    synthetic  - articles and live blogs of increasing size, plus a deeply
+                 nested tree that overflows the recursive renderer
+    --fixtures - every role tree found in a recorded fixture directory
+                 (see fixture_server.py / BLOOMBERG_RECORD_DIR)
+
+Usage:
+    python benchmarks/bench_get_contents.py [--repeat N] [--fixtures DIR]
+"""
+
+import ast
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPT_DIR.parent
+RECIPE = REPO_DIR / "bloomberg_filtered.recipe"
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from synthetic_epub import headline, sentence  # noqa: E402
+
+RENDERER_NAMES = {'_render_text', '_render_media', 'ROLE_RENDERERS', 'UNKNOWN_ROLE', 'get_contents'}
+
+
+def load_renderer():
+    """Exec just the get_contents() definitions from the recipe source."""
+    tree = ast.parse(RECIPE.read_text(encoding='utf-8'))
+    body = []
+    for node in tree.body:
+        names = {node.name} if isinstance(node, ast.FunctionDef) else {
+            t.id for t in getattr(node, 'targets', []) if isinstance(t, ast.Name)}
+        if names & RENDERER_NAMES:
+            body.append(node)
+    namespace = {}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(RECIPE), 'exec'), namespace)
+    return namespace['get_contents']
+
+
+def reference_get_contents(x):
+    """The recursive renderer get_contents() replaced, kept verbatim for parity."""
+    if x == '':
+        return ''
+    otype = x.get('role', '')
+    if otype == 'p':
+        return '<p>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</p>'
+    elif otype == 'text':
+        if 'style' in x:
+            return '<' + x['style'] + '>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</' + x['style'] + '>'
+        return x.get('text', '') + ''.join(map(reference_get_contents, x.get('parts', '')))
+    elif otype == 'br':
+        return '<br>'
+    elif otype == 'anchor':
+        return '<span>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</span>'
+    elif otype == 'h3':
+        return '<h4>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</h4>'
+    elif otype == 'ul':
+        return '<ul>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</ul>'
+    elif otype == 'li':
+        return '<li>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</li>'
+    elif otype == 'webview':
+        return '<br>' + x['html'] + ''.join(map(reference_get_contents, x.get('parts', '')))
+    elif otype == 'blockquote':
+        return '<blockquote>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</blockquote>'
+    elif otype in {'image', 'video'}:
+        return '<br><img src="{}"><div class="img">{}</div>\n'.format(
+                x['imageURLs']['default'], x['caption'] + '<i> ' + x['credit'] + '</i>'
+            )
+    elif otype in {'correction', 'disclaimer'}:
+        return '<p class="corr">' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</p>'
+    elif not any(x == otype for x in ['', 'ad', 'inline-newsletter', 'tabularData']):
+        return '<i>' + ''.join(map(reference_get_contents, x.get('parts', ''))) + '</i>'
+    return ''
+
+
+# ============================================================================
+# Payloads
+# ============================================================================
+
+def text(rng):
+    if rng.random() < 0.2:
+        return {'role': 'text', 'style': rng.choice(['b', 'em']), 'parts': [{'role': 'text', 'text': sentence(rng, 4)}]}
+    return {'role': 'text', 'text': sentence(rng)}
+
+
+def paragraph(rng):
+    parts = [text(rng) for _ in range(rng.randint(2, 6))]
+    if rng.random() < 0.3:
+        parts.append({'role': 'anchor', 'parts': [text(rng)]})
+    if rng.random() < 0.1:
+        parts.append({'role': 'br'})
+    return {'role': 'p', 'parts': parts}
+
+
+def block(rng):
+    kind = rng.random()
+    if kind < 0.6:
+        return paragraph(rng)
+    if kind < 0.7:
+        return {'role': 'h3', 'parts': [{'role': 'text', 'text': headline(rng)}]}
+    if kind < 0.78:
+        return {'role': 'ul', 'parts': [{'role': 'li', 'parts': [text(rng)]} for _ in range(3)]}
+    if kind < 0.84:
+        return {'role': 'blockquote', 'parts': [paragraph(rng)]}
+    if kind < 0.9:
+        return {'role': rng.choice(['image', 'video']), 'imageURLs': {'default': 'https://assets.bwbx.io/i.jpg'},
+                'caption': sentence(rng, 6), 'credit': 'Photographer: Synthetic', 'parts': [paragraph(rng)]}
+    if kind < 0.93:
+        return {'role': 'webview', 'html': '<div class="chart"></div>', 'parts': ['']}
+    if kind < 0.96:
+        return {'role': rng.choice(['ad', 'inline-newsletter', 'tabularData']), 'parts': [paragraph(rng)]}
+    if kind < 0.98:
+        return {'role': rng.choice(['correction', 'disclaimer']), 'parts': [paragraph(rng)]}
+    return {'role': 'footnote', 'parts': [paragraph(rng), '']}
+
+
+def article(blocks, seed):
+    rng = random.Random(seed)
+    return {'role': 'body', 'parts': [block(rng) for _ in range(blocks)]}
+
+
+def live_blog(updates, seed):
+    """A live blog: each update is a blockquote-wrapped post nesting a few levels deep."""
+    rng = random.Random(seed)
+    posts = []
+    for _ in range(updates):
+        post = {'role': 'blockquote', 'parts': [block(rng) for _ in range(4)]}
+        for _ in range(rng.randint(1, 4)):
+            post = {'role': 'li', 'parts': [post]}
+        posts.append({'role': 'ul', 'parts': [post]})
+    return {'role': 'body', 'parts': posts}
+
+
+def deep(depth):
+    node = {'role': 'text', 'text': 'bottom'}
+    for i in range(depth):
+        node = {'role': 'blockquote' if i % 2 else 'li', 'parts': [node]}
+    return node
+
+
+def fixture_trees(root: Path):
+    """Yield every list of role nodes found in recorded story JSON."""
+    def walk(value):
+        if isinstance(value, dict):
+            for child in value.values():
+                yield from walk(child)
+        elif isinstance(value, list):
+            if value and all(isinstance(v, dict) and 'role' in v for v in value):
+                yield {'role': 'body', 'parts': value}
+            else:
+                for child in value:
+                    yield from walk(child)
+
+    for path in sorted(root.rglob('*.json')):
+        try:
+            data = json.loads(path.read_bytes())
+        except ValueError:
+            continue
+        for i, tree in enumerate(walk(data)):
+            yield f"{path.relative_to(root)}#{i}", tree
+
+
+# ============================================================================
+# Main Entry Point
+# ============================================================================
+
+def time_ms(func, payload, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the recipe's get_contents() renderer")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per payload (default: 5)")
+    parser.add_argument("--fixtures", type=Path, help="Also time role trees from a recorded fixture directory")
+    args = parser.parse_args()
+
+    get_contents = load_renderer()
+    payloads = [
+        ("article/20 blocks", article(20, 1)),
+        ("article/200 blocks", article(200, 2)),
+        ("live blog/500 updates", live_blog(500, 3)),
+        ("live blog/5000 updates", live_blog(5000, 4)),
+        ("nested/depth 200", deep(200)),
+        ("nested/depth 5000", deep(5000)),
+    ]
+    if args.fixtures:
+        payloads += list(fixture_trees(args.fixtures))
+
+    print(f"{'Payload':<36} {'KB out':>8} {'recursive':>10} {'stack':>10} {'speedup':>8}")
+    print("-" * 76)
+    for name, payload in payloads:
+        size_kb = len(get_contents(payload)) / 1024
+        new_ms = time_ms(get_contents, payload, args.repeat)
+        try:
+            old_ms = time_ms(reference_get_contents, payload, args.repeat)
+        except RecursionError:
+            print(f"{name:<36} {size_kb:>8.1f} {'overflow':>10} {new_ms:>8.2f}ms {'':>8}")
+            continue
+        print(f"{name:<36} {size_kb:>8.1f} {old_ms:>8.2f}ms {new_ms:>8.2f}ms "
+              f"{old_ms / new_ms if new_ms else 0:>7.1f}x")
+    print("-" * 76)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: strip_img_tags() scanner vs the original regex chain
+
+Loads every HTML/XHTML document from the sample issues in books/ and times
+the single-pass scanner in process_epub against the three-regex chain it
+replaced. Also reports how many documents produce different output.
+
+Usage:
+    python benchmarks/bench_strip_img_tags.py [--repeat N] [--books DIR] [--attrs N]
+"""
+
+import re
+import sys
+import time
+import zipfile
+import argparse
+import statistics
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from process_epub import DOCUMENT_SUFFIXES, strip_img_tags  # noqa: E402
+
+
+def legacy_strip_img_tags(content: str) -> str:
+    """The original regex chain, kept verbatim for comparison."""
+    content = re.sub(r'<img[^>]*(?<!cover)[^>]*/?>', '', content, flags=re.IGNORECASE)
+    content = re.sub(r'<figure[^>]*>\s*</figure>', '', content, flags=re.IGNORECASE)
+    content = re.sub(r'<div[^>]*class="[^"]*img[^"]*"[^>]*>\s*</div>', '', content, flags=re.IGNORECASE)
+    return content
+
+
+def load_documents(books_dir: Path) -> list:
+    """Read every HTML body from every EPUB in books_dir."""
+    documents = []
+    for epub in sorted(books_dir.glob('*.epub')):
+        with zipfile.ZipFile(epub) as zf:
+            for name in zf.namelist():
+                if name.lower().endswith(DOCUMENT_SUFFIXES):
+                    documents.append(zf.read(name).decode('utf-8'))
+    return documents
+
+
+def time_function(func, documents: list, repeat: int) -> list:
+    """Return per-run wall times (seconds) for processing all documents."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in documents:
+            func(doc)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strip_img_tags implementations")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Timed runs per implementation (default: 20)")
+    parser.add_argument("--books", type=Path, default=SCRIPT_DIR.parent / "books",
+                        help="Directory of sample EPUBs (default: books/)")
+    parser.add_argument("--attrs", type=int, default=1000,
+                        help="Attribute count for the pathological case (default: 1000)")
+    args = parser.parse_args()
+
+    documents = load_documents(args.books)
+    if not documents:
+        print(f"No HTML documents found in {args.books}")
+        sys.exit(1)
+
+    total_bytes = sum(len(doc.encode('utf-8')) for doc in documents)
+    print(f"Documents: {len(documents)} ({total_bytes / 1024 / 1024:.2f} MB)")
+
+    mismatches = sum(1 for doc in documents if strip_img_tags(doc) != legacy_strip_img_tags(doc))
+    print(f"Output mismatches vs regex chain: {mismatches}")
+
+    results = {
+        "regex chain": time_function(legacy_strip_img_tags, documents, args.repeat),
+        "scanner": time_function(strip_img_tags, documents, args.repeat),
+    }
+
+    print(f"{'implementation':<16} {'median ms':>10} {'min ms':>10} {'MB/s':>10}")
+    for label, timings in results.items():
+        median = statistics.median(timings)
+        print(f"{label:<16} {median * 1000:>10.2f} {min(timings) * 1000:>10.2f} "
+              f"{total_bytes / 1024 / 1024 / median:>10.1f}")
+
+    speedup = statistics.median(results["regex chain"]) / statistics.median(results["scanner"])
+    print(f"Speedup: {speedup:.2f}x")
+
+    # Worst case for the old lookbehind pattern: an <img> with a long,
+    # unterminated attribute list forces it to backtrack quadratically
+    pathological = ['<img ' + 'data-x="y" ' * args.attrs]
+    print(f"Unterminated <img> with {args.attrs} attributes:")
+    for label, func in (("regex chain", legacy_strip_img_tags), ("scanner", strip_img_tags)):
+        print(f"  {label:<14} {time_function(func, pathological, 1)[0] * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Offline Stand-in for the Bloomberg Mobile API
+
+Replays recorded (or synthetic) cdn-mobapi.bloomberg.com responses so
+bloomberg_filtered.recipe can be run and benchmarked without network
+access. Each response is delayed by a configurable latency +/- jitter to
+model real round trips; bodies carry ETags and honour If-None-Match so
+the recipe's cache revalidation path is exercised too.
+
+Fixtures come from a record run of the recipe (BLOOMBERG_RECORD_DIR) or
+are generated in memory with --synthetic.
+
+Usage:
+    # Record once against the live API
+    BLOOMBERG_RECORD_DIR=fixtures/2026-02-16 ebook-convert bloomberg_filtered.recipe out.epub
+
+    # Replay
+    python benchmarks/fixture_server.py --fixtures fixtures/2026-02-16 --shift-dates --latency 80 --jitter 40
+    python benchmarks/fixture_server.py --synthetic 120
+    BLOOMBERG_API_BASE=http://127.0.0.1:8090 BLOOMBERG_HTTP_CACHE=off \\
+        ebook-convert bloomberg_filtered.recipe out.epub
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import urllib.parse
+from pathlib import Path
+from email.utils import formatdate
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from synthetic_epub import SECTIONS, headline, sentence  # noqa: E402
+
+NAV_PATH = '/wssmobile/v1/navigation/bloomberg_app/search-v2'
+STORY_PATH = '/wssmobile/v1/stories/'
+BODY_PATH = '/wssmobile/v1/bw/news/stories/'
+
+
+def fixture_path(root: Path, url: str) -> Path:
+    """Where a response for url lives in a fixture directory (matches the recipe's recorder)."""
+    parts = urllib.parse.urlsplit(url)
+    name = parts.path.lstrip('/')
+    if parts.query:
+        name += '@' + urllib.parse.quote(parts.query, safe='')
+    return root / (name + '.json')
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+def load_fixtures(root: Path) -> dict:
+    """Map request path (with query) to body for every recorded response."""
+    fixtures = {}
+    for path in root.rglob('*.json'):
+        name = path.relative_to(root).as_posix()[:-len('.json')]
+        target, _, query = name.partition('@')
+        key = '/' + target + ('?' + urllib.parse.unquote(query) if query else '')
+        fixtures[key] = path.read_bytes()
+    return fixtures
+
+
+def shift_dates(fixtures: dict) -> dict:
+    """
+    Move every story's published time forward so the newest recorded story
+    is 'now'; otherwise the recipe's oldest_article filter drops them all.
+    """
+    listings = {}
+    newest = 0
+    for key, body in fixtures.items():
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and 'modules' in data:
+            listings[key] = data
+            for module in data['modules']:
+                for story in module.get('stories') or []:
+                    newest = max(newest, story.get('published', 0))
+
+    offset = int(time.time()) - newest - 60
+    for key, data in listings.items():
+        for module in data['modules']:
+            for story in module.get('stories') or []:
+                if 'published' in story:
+                    story['published'] += offset
+        fixtures[key] = json.dumps(data).encode('utf-8')
+    return fixtures
+
+
+def synthetic_fixtures(articles: int, seed: int = 0, body_kb: int = 6) -> dict:
+    """Generate a navigation, four section listings and `articles` stories."""
+    rng = random.Random(seed)
+    now = int(time.time())
+    sections = SECTIONS + ['Politics']  # One section the recipe must filter out
+    fixtures = {
+        NAV_PATH: json.dumps({'searchNav': [{'items': [
+            {'title': section, 'links': {'self': {'href': f'/wssmobile/v1/pages/{section.lower()}'}}}
+            for section in sections
+        ]}]}).encode('utf-8'),
+    }
+
+    listings = {section: [] for section in sections}
+    for i in range(articles):
+        section = sections[i % len(sections)]
+        story_id = f'SYN{seed:03d}{i:05d}'
+        title = headline(rng)
+        published = now - rng.randint(60, 20 * 3600)
+        listings[section].append({
+            'type': 'article', 'internalID': story_id, 'title': title,
+            'published': published, 'autoGeneratedSummary': sentence(rng),
+        })
+        fixtures[STORY_PATH + story_id] = json.dumps({
+            'title': title, 'type': 'article',
+            'longURL': f'https://www.bloomberg.com/news/articles/{story_id.lower()}',
+            'primaryCategory': section, 'abstract': [sentence(rng, 10), sentence(rng, 10)],
+            'byline': 'Synthetic Reporter', 'updatedAt': published + 600,
+            'ledeImage': {'imageURLs': {'default': f'https://assets.bwbx.io/images/{story_id}/-1x-1.jpg'},
+                          'caption': sentence(rng, 8), 'credit': 'Photographer: Synthetic'},
+        }).encode('utf-8')
+        paragraphs = []
+        while sum(map(len, paragraphs)) < body_kb * 1024:
+            paragraphs.append('<p>' + ' '.join(sentence(rng) for _ in range(4)) + '</p>')
+        fixtures[BODY_PATH + story_id] = json.dumps({'html': ''.join(paragraphs)}).encode('utf-8')
+
+    for section, stories in listings.items():
+        fixtures[f'/wssmobile/v1/pages/{section.lower()}'] = json.dumps(
+            {'modules': [{'stories': stories}, {'stories': None}]}
+        ).encode('utf-8')
+    return fixtures
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class FixtureServer:
+    def __init__(self, fixtures: dict, latency_ms: float, jitter_ms: float, seed: int = 0):
+        self.fixtures = fixtures
+        self.etags = {key: '"' + hashlib.sha1(body).hexdigest()[:20] + '"' for key, body in fixtures.items()}
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rng = random.Random(seed)
+        self.stats = {'200': 0, '304': 0, '404': 0}
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 30)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                request_line, *lines = head.decode('latin-1').split('\r\n')
+                _, target, _ = request_line.split(' ', 2)
+                headers = {k.strip().lower(): v.strip() for k, _, v in (l.partition(':') for l in lines if ':' in l)}
+
+                await asyncio.sleep(self.delay())
+
+                body = self.fixtures.get(target)
+                if body is None:
+                    status, body, extra = 404, b'{"error": "no fixture"}', {}
+                elif headers.get('if-none-match') == self.etags[target]:
+                    status, body, extra = 304, b'', {'ETag': self.etags[target]}
+                else:
+                    status, extra = 200, {'ETag': self.etags[target]}
+                self.stats[str(status)] += 1
+
+                reason = {200: 'OK', 304: 'Not Modified', 404: 'Not Found'}[status]
+                response = [f'HTTP/1.1 {status} {reason}', f'Date: {formatdate(usegmt=True)}',
+                            'Content-Type: application/json', f'Content-Length: {len(body)}']
+                response += [f'{k}: {v}' for k, v in extra.items()]
+                writer.write(('\r\n'.join(response) + '\r\n\r\n').encode('latin-1') + body)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server: FixtureServer, host: str, port: int):
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Serving {len(server.fixtures)} fixtures on http://{host}:{port} "
+          f"(latency {server.latency * 1000:.0f} ms +/- {server.jitter * 1000:.0f} ms)")
+    print(f"Run the recipe with BLOOMBERG_API_BASE=http://{host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Bloomberg mobile API fixtures locally")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixtures", type=Path, help="Directory recorded with BLOOMBERG_RECORD_DIR")
+    source.add_argument("--synthetic", type=int, metavar="ARTICLES", help="Generate this many synthetic stories")
+    parser.add_argument("--shift-dates", action="store_true",
+                        help="Move recorded publish times up to now so oldest_article keeps them")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=50, help="Mean response delay in ms (default: 50)")
+    parser.add_argument("--jitter", type=float, default=20, help="Uniform +/- jitter in ms (default: 20)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        if not fixtures:
+            print(f"No fixtures found in {args.fixtures}")
+            sys.exit(1)
+        if args.shift_dates:
+            fixtures = shift_dates(fixtures)
+    else:
+        fixtures = synthetic_fixtures(args.synthetic, args.seed)
+
+    server = FixtureServer(fixtures, args.latency, args.jitter, args.seed)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"\nResponses: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
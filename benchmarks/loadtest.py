@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Load Test for the OPDS Serving Path
+
+Replays e-reader sync traffic against opds_server.py (or any server
+hosting the files generate_opds.py produces) at increasing concurrency
+and reports requests/sec, latency percentiles, bytes/sec and error rate.
+
+Each simulated reader holds one keep-alive connection and loops over a
+weighted mix of requests:
+    poll        - GET opds.xml (Accept-Encoding: gzip, br)
+    conditional - GET a catalog page with If-None-Match (expects 304)
+    download    - GET a whole EPUB
+    resume      - GET a random byte range of an EPUB (expects 206)
+
+Books are discovered from the acquisition links in opds.xml.
+
+Usage:
+    python benchmarks/loadtest.py [--url URL] [--concurrency 1,8,32,128] [--duration SECONDS]
+    python benchmarks/loadtest.py --start-server   # Launch opds_server.py on a free port first
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+import urllib.parse
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPT_DIR.parent
+
+DEFAULT_URL = "http://127.0.0.1:8080/"
+DEFAULT_CONCURRENCY = "1,8,32,128"
+DEFAULT_MIX = "poll=40,conditional=40,download=10,resume=10"
+READ_CHUNK = 256 * 1024
+ACQUISITION_LINK = re.compile(r'<link href="([^"]+\.epub)" rel="http://opds-spec.org/acquisition"')
+
+
+# ============================================================================
+# HTTP Client
+# ============================================================================
+
+class Connection:
+    """A keep-alive HTTP/1.1 connection that reads and discards bodies."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path, headers=None, keep_body=False):
+        """
+        Send a GET; return (status, response headers, body bytes received),
+        or the body itself in place of the byte count when keep_body is set.
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "User-Agent: opds-loadtest"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        status = int(status_line.split(' ')[1])
+        response_headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, _, value = line.partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+
+        remaining = int(response_headers.get("content-length", "0"))
+        received = 0
+        body = []
+        while remaining:
+            chunk = await self.reader.read(min(READ_CHUNK, remaining))
+            if not chunk:
+                raise ConnectionError("server closed connection mid-body")
+            received += len(chunk)
+            remaining -= len(chunk)
+            if keep_body:
+                body.append(chunk)
+
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, b''.join(body) if keep_body else received
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+# ============================================================================
+# Traffic Model
+# ============================================================================
+
+async def discover(host, port, base_path):
+    """Fetch opds.xml once; return catalog paths, their ETags and book paths with sizes."""
+    conn = Connection(host, port)
+    try:
+        status, headers, catalog = await conn.request(f"{base_path}opds.xml", keep_body=True)
+        if status != 200:
+            raise RuntimeError(f"GET {base_path}opds.xml returned {status}")
+
+        etags = {f"{base_path}opds.xml": headers.get("etag")}
+        for page in ("opds/index.xml", "health.json"):
+            status, page_headers, _ = await conn.request(f"{base_path}{page}")
+            if status == 200 and page_headers.get("etag"):
+                etags[f"{base_path}{page}"] = page_headers["etag"]
+
+        books = []
+        for href in sorted(set(ACQUISITION_LINK.findall(catalog.decode('utf-8')))):
+            name = urllib.parse.urlsplit(href).path.rsplit('/', 1)[-1]
+            path = f"{base_path}books/{name}"
+            status, book_headers, _ = await conn.request(path, {"Range": "bytes=0-0"})
+            if status in (200, 206):
+                size = int(book_headers.get("content-range", "/0").rsplit('/', 1)[-1] or 0)
+                books.append((path, size or int(book_headers.get("content-length", "0"))))
+    finally:
+        await conn.close()
+
+    if not books:
+        raise RuntimeError("No downloadable books found in opds.xml")
+    return etags, books
+
+
+def build_request(kind, etags, books, rng):
+    """Return (path, headers, expected statuses) for one request of the given kind."""
+    if kind == "poll":
+        return next(iter(etags)), {"Accept-Encoding": "gzip, br"}, (200,)
+    if kind == "conditional":
+        path, etag = rng.choice([(p, e) for p, e in etags.items() if e])
+        return path, {"If-None-Match": etag}, (304,)
+    path, size = rng.choice(books)
+    if kind == "download":
+        return path, {}, (200,)
+    start = rng.randrange(max(1, size - 1))
+    end = min(size - 1, start + rng.randrange(64 * 1024, 1024 * 1024))
+    return path, {"Range": f"bytes={start}-{end}"}, (206,)
+
+
+async def reader_loop(host, port, deadline, mix, etags, books, samples, seed):
+    """One simulated e-reader: loop over the request mix until the deadline."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*mix.items())
+    conn = Connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            path, headers, expected = build_request(kind, etags, books, rng)
+            start = time.perf_counter()
+            try:
+                status, _, received = await conn.request(path, headers)
+                ok = status in expected
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                await conn.close()
+                status, received, ok = 0, 0, False
+            samples.append((kind, (time.perf_counter() - start) * 1000, received, ok))
+    finally:
+        await conn.close()
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def summarize(samples, elapsed):
+    latencies = [s[1] for s in samples] or [0.0]
+    received = sum(s[2] for s in samples)
+    errors = sum(1 for s in samples if not s[3])
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mb_per_s": round(received / elapsed / 1024 / 1024, 2),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "by_kind": {
+            kind: round(statistics.median([s[1] for s in samples if s[0] == kind]), 2)
+            for kind in sorted({s[0] for s in samples})
+        },
+    }
+
+
+async def run_level(host, port, concurrency, duration, mix, etags, books):
+    samples = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        reader_loop(host, port, deadline, mix, etags, books, samples, seed=i)
+        for i in range(concurrency)
+    ))
+    return summarize(samples, time.perf_counter() - start)
+
+
+def print_row(concurrency, r):
+    print(f"{concurrency:>6} {r['requests']:>9,} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+          f"{r['p99_ms']:>9.2f} {r['mb_per_s']:>9.2f} {r['error_rate']:>8.2%}")
+
+
+# ============================================================================
+# Main Entry Point
+# ============================================================================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    """Launch opds_server.py from the repo root and wait until it answers."""
+    process = subprocess.Popen(
+        [sys.executable, str(REPO_DIR / "opds_server.py"), "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(50):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("opds_server.py did not start")
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        kind, _, weight = item.partition('=')
+        if kind not in ("poll", "conditional", "download", "resume"):
+            raise argparse.ArgumentTypeError(f"unknown request kind: {kind}")
+        mix[kind] = float(weight)
+    return mix
+
+
+async def run(args):
+    url = urllib.parse.urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    base_path = url.path if url.path.endswith('/') else url.path + '/'
+
+    etags, books = await discover(host, port, base_path)
+    print(f"Target: {args.url} ({len(books)} books, {len(etags)} catalog files)")
+    print(f"Mix: {', '.join(f'{k}={v:g}' for k, v in args.mix.items())}; {args.duration}s per level")
+    print()
+    print(f"{'conc':>6} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB/s':>9} {'errors':>8}")
+    print("-" * 76)
+
+    results = {}
+    for concurrency in args.concurrency:
+        result = await run_level(host, port, concurrency, args.duration, args.mix, etags, books)
+        results[str(concurrency)] = result
+        print_row(concurrency, result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the OPDS catalog and book serving path")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Server base URL (default: {DEFAULT_URL})")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY,
+                        type=lambda s: [int(c) for c in s.split(',')],
+                        help=f"Comma-separated concurrent readers per level (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per level (default: 10)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Request weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--start-server", action="store_true",
+                        help="Start opds_server.py on a free local port and test it")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    process = None
+    if args.start_server:
+        port = free_port()
+        process = start_server(port)
+        args.url = f"http://127.0.0.1:{port}/"
+
+    try:
+        results = asyncio.run(run(args))
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        args.output.write_text(json.dumps({"url": args.url, "duration_s": args.duration,
+                                           "mix": args.mix, "levels": results}, indent=2), encoding='utf-8')
+        print(f"Results written: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Bloomberg Daily
+
+Runs process_epub.py, generate_opds.py and cleanup_old_books.py against
+synthetic issues (see synthetic_epub.py) and reports latency percentiles,
+throughput, peak memory and, for process_epub, a per-stage breakdown.
+Results can be compared against a stored baseline to catch regressions.
+
+Scenarios:
+    process_epub  - one issue with 10, 100 and 1000 articles
+    generate_opds - catalog generation over 7 and 365 issues
+    cleanup       - archive cleanup over 7 and 365 issues (keep 7)
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--repeat N]
+    python benchmarks/run_benchmarks.py --check            # Fail on regressions vs baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # Store results as the new baseline
+"""
+
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import process_epub  # noqa: E402
+import generate_opds  # noqa: E402
+import cleanup_old_books  # noqa: E402
+from synthetic_epub import make_issue, make_archive  # noqa: E402
+
+BASELINE_FILE = SCRIPT_DIR / "baseline.json"
+DEFAULT_TOLERANCE = 0.25  # Allowed p50 slowdown vs baseline before flagging
+
+ARTICLE_COUNTS = [10, 100, 1000]
+ARCHIVE_SIZES = [7, 365]
+
+
+# ============================================================================
+# Measurement Helpers
+# ============================================================================
+
+def percentile(samples: list, pct: int) -> float:
+    """pct-th percentile of samples (nearest-rank on the interpolated quantiles)."""
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """
+    Time func() `repeat` times, then once more under tracemalloc for peak memory.
+
+    setup(), if given, runs untimed before every call.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "peak_kb": peak // 1024,
+    }
+
+
+def redirect_paths(module, workdir: Path) -> dict:
+    """
+    Point a script's module-level paths (books/, outputs, indexes) at workdir.
+
+    Returns the original values so they can be restored.
+    """
+    base = Path(getattr(module, 'SCRIPT_DIR', Path(module.__file__).parent)).resolve()
+    originals = {}
+    for name, value in vars(module).items():
+        if name == 'SCRIPT_DIR' or not isinstance(value, Path):
+            continue
+        try:
+            relative = value.resolve().relative_to(base)
+        except ValueError:
+            continue
+        originals[name] = value
+        setattr(module, name, workdir / relative)
+    return originals
+
+
+def restore_paths(module, originals: dict):
+    for name, value in originals.items():
+        setattr(module, name, value)
+
+
+# ============================================================================
+# Scenarios
+# ============================================================================
+
+def bench_process_epub(workdir: Path, articles: int, repeat: int) -> dict:
+    source = make_issue(workdir / f"issue_{articles}.epub", articles=articles,
+                        images=articles * 2, html_kb=8, toc_depth=3, seed=articles)
+    output = workdir / f"issue_{articles}_out.epub"
+    size_mb = source.stat().st_size / 1024 / 1024
+
+    stage_samples = {}
+
+    def run():
+        stages = process_epub.process_epub(str(source), str(output), use_cache=False)
+        for record in stages:
+            stage_samples.setdefault(record["stage"], []).append(record["wall_ms"])
+
+    result = measure(run, repeat)
+    result["input_mb"] = round(size_mb, 2)
+    result["throughput_mb_s"] = round(size_mb / (result["p50_ms"] / 1000), 2)
+    result["stages_p50_ms"] = {name: round(statistics.median(values), 2)
+                               for name, values in stage_samples.items()}
+    return result
+
+
+def bench_generate_opds(workdir: Path, books: int, repeat: int) -> dict:
+    site = workdir / f"opds_{books}"
+    make_archive(site / "books", books)
+    originals = redirect_paths(generate_opds, site)
+    try:
+        result = measure(generate_opds.main, repeat)
+    finally:
+        restore_paths(generate_opds, originals)
+    result["books_per_s"] = round(books / (result["p50_ms"] / 1000), 1)
+    return result
+
+
+def bench_cleanup(workdir: Path, books: int, repeat: int) -> dict:
+    pristine = workdir / f"cleanup_{books}_pristine"
+    make_archive(pristine, books)
+    site = workdir / f"cleanup_{books}"
+
+    def reset():
+        shutil.rmtree(site / "books", ignore_errors=True)
+        shutil.copytree(pristine, site / "books")
+
+    originals = redirect_paths(cleanup_old_books, site)
+    try:
+        result = measure(lambda: cleanup_old_books.cleanup(7), repeat, setup=reset)
+    finally:
+        restore_paths(cleanup_old_books, originals)
+    result["books_per_s"] = round(books / (result["p50_ms"] / 1000), 1)
+    return result
+
+
+def run_all(repeat: int, quick: bool) -> dict:
+    article_counts = ARTICLE_COUNTS[:2] if quick else ARTICLE_COUNTS
+    archive_sizes = ARCHIVE_SIZES[:1] if quick else ARCHIVE_SIZES
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for articles in article_counts:
+            print(f"  process_epub: {articles} articles...")
+            results[f"process_epub/articles={articles}"] = bench_process_epub(workdir, articles, repeat)
+        for books in archive_sizes:
+            print(f"  generate_opds: {books} books...")
+            results[f"generate_opds/books={books}"] = bench_generate_opds(workdir, books, repeat)
+            print(f"  cleanup: {books} books...")
+            results[f"cleanup/books={books}"] = bench_cleanup(workdir, books, repeat)
+    return results
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def print_report(results: dict, baseline: dict = None, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """Print the results table; return the names of regressed scenarios."""
+    baseline = baseline or {}
+    regressions = []
+
+    print()
+    print(f"{'Scenario':<30} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KB':>9} {'vs base':>9}")
+    print("-" * 80)
+    for name, r in results.items():
+        delta = ""
+        base = baseline.get(name)
+        if base and base.get("p50_ms"):
+            change = r["p50_ms"] / base["p50_ms"] - 1
+            delta = f"{change:+.0%}"
+            if change > tolerance:
+                regressions.append(name)
+                delta += " !"
+        print(f"{name:<30} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+              f"{r['peak_kb']:>9,} {delta:>9}")
+
+        if "throughput_mb_s" in r:
+            print(f"    {r['input_mb']} MB in, {r['throughput_mb_s']} MB/s")
+        if "books_per_s" in r:
+            print(f"    {r['books_per_s']} books/s")
+        for stage, ms in r.get("stages_p50_ms", {}).items():
+            print(f"    {stage:<24} {ms:>9.1f} ms")
+
+    print("-" * 80)
+    if regressions:
+        print(f"Regressions (> {tolerance:.0%} slower p50 than baseline): {', '.join(regressions)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Bloomberg Daily scripts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario (default: 5)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Skip the 1000-article and 365-book scenarios")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this path")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE,
+                        help=f"Baseline JSON to compare against (default: {BASELINE_FILE.name})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed p50 slowdown before flagging a regression (default: 0.25)")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on regressions")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    # The scripts log every step at INFO; keep the report readable
+    logging.disable(logging.INFO)
+
+    print(f"Running benchmarks ({args.repeat} runs per scenario)...")
+    results = run_all(args.repeat, args.quick)
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8')).get("results", {})
+
+    regressions = print_report(results, baseline, args.tolerance)
+
+    report = {
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Results written: {args.output}")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+        print(f"Baseline updated: {args.baseline}")
+
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
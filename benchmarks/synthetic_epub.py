@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Synthetic Bloomberg-style EPUB Generator
+
+Builds EPUBs shaped like Calibre's recipe output (feed_N/article_M/index.html,
+per-article images/, titlepage, masthead, toc.ncx, content.opf) so the
+processing scripts can be benchmarked without real issues.
+
+Usage:
+    python benchmarks/synthetic_epub.py output.epub [--articles N] [--images N]
+                                        [--html-kb N] [--toc-depth N]
+    python benchmarks/synthetic_epub.py --archive DIR --books N
+"""
+
+import random
+import zipfile
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
+
+SECTIONS = ['Industries', 'Technology', 'AI', 'Latest']
+
+WORDS = (
+    "market stocks investors shares bank rates inflation earnings revenue chip "
+    "demand supply growth policy trade tariff energy oil gold bond yield data "
+    "model company deal billion quarter forecast economy central analysts said"
+).split()
+
+# Smallest plausible JPEG framing; the payload is random filler
+JPEG_HEADER = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'
+JPEG_TRAILER = b'\xff\xd9'
+
+
+def fake_jpeg(rng: random.Random, size: int) -> bytes:
+    """Incompressible bytes dressed up as a JPEG."""
+    return JPEG_HEADER + rng.randbytes(max(0, size - len(JPEG_HEADER) - 2)) + JPEG_TRAILER
+
+
+def sentence(rng: random.Random, words: int = 18) -> str:
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def headline(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(6, 12)))
+
+
+def article_html(rng: random.Random, title: str, images: list, html_kb: int, subheads: int) -> str:
+    """One article body in the style of the recipe's preprocess_raw_html output."""
+    parts = [
+        "<?xml version='1.0' encoding='utf-8'?>\n"
+        '<html xmlns="http://www.w3.org/1999/xhtml">\n  <head>\n    <title>Unknown</title>\n'
+        '    <meta http-equiv="Content-Type" content="text/html; charset=utf-8"/>\n'
+        '  <link rel="stylesheet" type="text/css" href="../../stylesheet.css"/>\n'
+        '<link rel="stylesheet" type="text/css" href="../../page_styles.css"/>\n</head>\n'
+        '  <body class="calibre">\n',
+        f'  <h1 title="https://www.bloomberg.com/news/articles/synthetic" class="calibre8">{xml_escape(title)}</h1>\n',
+        f'  <p class="auth">By Synthetic Reporter | Updated on Feb 15, 2026 at 06:28 PM</p>\n',
+    ]
+
+    for image in images:
+        parts.append(
+            f'  <div data-type="image" class="calibre9">\n    <img src="images/{image}" class="calibre3"/>\n'
+            f'    <div class="img">{sentence(rng, 10)}<i> Photographer: Synthetic</i></div>\n  </div>\n'
+        )
+
+    parts.append('  <div class="calibre9">\n')
+    body_size = 0
+    target = html_kb * 1024
+    paragraph = 0
+    while body_size < target:
+        if subheads and paragraph and paragraph % 6 == 0 and paragraph // 6 <= subheads:
+            parts.append(f'   <h4 id="sub_{paragraph // 6}">{headline(rng)}</h4>\n')
+        text = ' '.join(sentence(rng) for _ in range(rng.randint(2, 5)))
+        block = f'   <p class="calibre10">{text}</p>\n'
+        parts.append(block)
+        body_size += len(block)
+        paragraph += 1
+    parts.append('  </div>\n</body></html>\n')
+
+    return ''.join(parts)
+
+
+def section_index_html(section: str, articles: list) -> str:
+    items = ''.join(
+        f'<li id="article_{i}" class="calibre7"><a href="article_{i}/index.html" class="article">'
+        f'{xml_escape(title)}</a></li>\n'
+        for i, (title, _) in enumerate(articles)
+    )
+    return (
+        "<?xml version='1.0' encoding='utf-8'?>\n"
+        f'<html xmlns="http://www.w3.org/1999/xhtml"><head><title>{section}</title></head>\n'
+        f'<body class="calibre"><h2 class="calibre_feed_title">{section}</h2>\n'
+        f'<ul class="calibre_feed_list">{items}</ul></body></html>\n'
+    )
+
+
+def nav_point(counter: list, label: str, src: str, children: str = '', indent: int = 2) -> str:
+    counter[0] += 1
+    pad = '  ' * indent
+    return (
+        f'{pad}<navPoint id="num_{counter[0]}" playOrder="{counter[0]}" class="chapter">\n'
+        f'{pad}  <navLabel><text>{xml_escape(label)}</text></navLabel>\n'
+        f'{pad}  <content src="{src}"/>\n{children}{pad}</navPoint>\n'
+    )
+
+
+def make_issue(path: Path, articles: int = 30, images: int = 60, html_kb: int = 8,
+               toc_depth: int = 2, seed: int = 0, issue_date: date = None) -> Path:
+    """
+    Write a synthetic Calibre-style EPUB.
+
+    articles are spread round-robin over the four sections, images are
+    spread over the articles, html_kb is the approximate body size per
+    article and toc_depth is 1 (flat), 2 (section > article) or 3 (adds
+    article subheadings).
+    """
+    rng = random.Random(seed)
+    issue_date = issue_date or date(2026, 2, 15)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    feeds = {section: [] for section in SECTIONS}
+    image_counts = [images // articles + (1 if i < images % articles else 0) for i in range(articles)] if articles else []
+    for i in range(articles):
+        feeds[SECTIONS[i % len(SECTIONS)]].append((headline(rng), image_counts[i]))
+
+    manifest = [
+        ('cover', 'cover.jpg', 'image/jpeg'),
+        ('titlepage', 'titlepage.xhtml', 'application/xhtml+xml'),
+        ('masthead', 'mastheadImage.jpg', 'image/jpeg'),
+        ('index', 'index.html', 'application/xhtml+xml'),
+        ('css', 'stylesheet.css', 'text/css'),
+        ('pagecss', 'page_styles.css', 'text/css'),
+        ('ncx', 'toc.ncx', 'application/x-dtbncx+xml'),
+    ]
+    spine = ['titlepage', 'index']
+    counter = [0]
+    toc_points = []
+    item_id = 0
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        zf.writestr('META-INF/container.xml',
+                    '<?xml version="1.0"?>\n<container version="1.0" '
+                    'xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+                    '   <rootfiles>\n      <rootfile full-path="content.opf" '
+                    'media-type="application/oebps-package+xml"/>\n   </rootfiles>\n</container>\n')
+        zf.writestr('titlepage.xhtml',
+                    "<?xml version='1.0' encoding='utf-8'?>\n<html xmlns=\"http://www.w3.org/1999/xhtml\">"
+                    '<body><div><svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                    '<image xlink:href="cover.jpg"/></svg></div></body></html>\n')
+        zf.writestr('cover.jpg', fake_jpeg(rng, 60 * 1024))
+        zf.writestr('mastheadImage.jpg', fake_jpeg(rng, 8 * 1024))
+        zf.writestr('stylesheet.css', '.calibre { display: block }\n' * 40)
+        zf.writestr('page_styles.css', '@page { margin: 5pt }\n')
+
+        main_index = []
+        for feed_no, (section, feed_articles) in enumerate(feeds.items()):
+            if not feed_articles:
+                continue
+            feed_dir = f'feed_{feed_no}'
+            zf.writestr(f'{feed_dir}/index.html', section_index_html(section, feed_articles))
+            item_id += 1
+            manifest.append((f'id{item_id}', f'{feed_dir}/index.html', 'application/xhtml+xml'))
+            spine.append(f'id{item_id}')
+            main_index.append(f'<li><a href="{feed_dir}/index.html">{section}</a></li>')
+
+            article_points = []
+            for art_no, (title, image_count) in enumerate(feed_articles):
+                art_dir = f'{feed_dir}/article_{art_no}'
+                image_names = [f'img{n + 1}.jpg' for n in range(image_count)]
+                for image in image_names:
+                    zf.writestr(f'{art_dir}/images/{image}', fake_jpeg(rng, rng.randint(10, 50) * 1024))
+                    item_id += 1
+                    manifest.append((f'id{item_id}', f'{art_dir}/images/{image}', 'image/jpeg'))
+
+                subheads = 3 if toc_depth >= 3 else 0
+                zf.writestr(f'{art_dir}/index.html', article_html(rng, title, image_names, html_kb, subheads))
+                item_id += 1
+                manifest.append((f'id{item_id}', f'{art_dir}/index.html', 'application/xhtml+xml'))
+                spine.append(f'id{item_id}')
+
+                children = ''
+                if toc_depth >= 3:
+                    children = ''.join(
+                        nav_point(counter, headline(rng), f'{art_dir}/index.html#sub_{n}', indent=4)
+                        for n in range(1, subheads + 1)
+                    )
+                article_points.append(nav_point(counter, title, f'{art_dir}/index.html', children, indent=3))
+
+            if toc_depth >= 2:
+                toc_points.append(nav_point(counter, section, f'{feed_dir}/index.html', ''.join(article_points)))
+            else:
+                toc_points.extend(article_points)
+
+        zf.writestr('index.html',
+                    "<?xml version='1.0' encoding='utf-8'?>\n<html xmlns=\"http://www.w3.org/1999/xhtml\">"
+                    f"<body><ul>{''.join(main_index)}</ul></body></html>\n")
+
+        zf.writestr('toc.ncx',
+                    "<?xml version='1.0' encoding='utf-8'?>\n"
+                    '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1" xml:lang="eng">\n'
+                    f'  <head>\n    <meta name="dtb:uid" content="synthetic-{seed}"/>\n'
+                    f'    <meta name="dtb:depth" content="{toc_depth}"/>\n  </head>\n'
+                    f'  <docTitle><text>Bloomberg Daily [{issue_date:%a, %d %b %Y}]</text></docTitle>\n'
+                    f"  <navMap>\n{''.join(toc_points)}  </navMap>\n</ncx>\n")
+
+        items = ''.join(f'    <item id="{i}" href="{h}" media-type="{m}"/>\n' for i, h, m in manifest)
+        itemrefs = ''.join(f'    <itemref idref="{i}"/>\n' for i in spine)
+        zf.writestr('content.opf',
+                    "<?xml version='1.0' encoding='utf-8'?>\n"
+                    '<package xmlns="http://www.idpf.org/2007/opf" version="2.0" unique-identifier="uuid_id">\n'
+                    '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:opf="http://www.idpf.org/2007/opf">\n'
+                    f'    <dc:title>Bloomberg Daily [{issue_date:%a, %d %b %Y}]</dc:title>\n'
+                    '    <dc:creator opf:file-as="Bloomberg" opf:role="aut">Bloomberg</dc:creator>\n'
+                    '    <dc:language>en</dc:language>\n'
+                    f'    <dc:date>{issue_date.isoformat()}T00:05:42+00:00</dc:date>\n'
+                    f'    <dc:identifier id="uuid_id" opf:scheme="uuid">synthetic-{seed}</dc:identifier>\n'
+                    '    <meta name="cover" content="cover"/>\n  </metadata>\n'
+                    f'  <manifest>\n{items}  </manifest>\n'
+                    f'  <spine toc="ncx">\n{itemrefs}  </spine>\n'
+                    '  <guide>\n    <reference type="other.masthead" href="mastheadImage.jpg" title="Masthead Image"/>\n'
+                    '    <reference type="cover" href="titlepage.xhtml" title="Cover"/>\n  </guide>\n</package>\n')
+
+    return path
+
+
+def make_archive(books_dir: Path, count: int, newest: date = None, **issue_options) -> list:
+    """Write `count` daily issues named Bloomberg_YYYY-MM-DD.epub, newest first."""
+    books_dir = Path(books_dir)
+    books_dir.mkdir(parents=True, exist_ok=True)
+    newest = newest or date(2026, 2, 15)
+    options = {'articles': 4, 'images': 0, 'html_kb': 2, 'toc_depth': 2}
+    options.update(issue_options)
+
+    paths = []
+    for i in range(count):
+        issue_date = newest - timedelta(days=i)
+        path = books_dir / f"Bloomberg_{issue_date.isoformat()}.epub"
+        paths.append(make_issue(path, seed=i, issue_date=issue_date, **options))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Bloomberg-style EPUBs")
+    parser.add_argument("output", nargs="?", type=Path, help="Output EPUB")
+    parser.add_argument("--articles", type=int, default=30, help="Article count (default: 30)")
+    parser.add_argument("--images", type=int, default=60, help="Image count (default: 60)")
+    parser.add_argument("--html-kb", type=int, default=8, help="Body size per article in KB (default: 8)")
+    parser.add_argument("--toc-depth", type=int, default=2, choices=[1, 2, 3], help="TOC depth (default: 2)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--archive", type=Path, help="Write a directory of daily issues instead")
+    parser.add_argument("--books", type=int, default=7, help="Issue count for --archive (default: 7)")
+    args = parser.parse_args()
+
+    if args.archive:
+        paths = make_archive(args.archive, args.books)
+        print(f"Wrote {len(paths)} issues to {args.archive}")
+    elif args.output:
+        make_issue(args.output, args.articles, args.images, args.html_kb, args.toc_depth, args.seed)
+        print(f"Wrote {args.output} ({args.output.stat().st_size:,} bytes)")
+    else:
+        parser.error("an output EPUB or --archive DIR is required")
+
+
+if __name__ == '__main__':
+    main()
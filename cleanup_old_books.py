@@ -98,6 +98,8 @@ def cleanup(keep_count=7):
             size = old_book.stat().st_size
             log.info(f"  Removing: {old_book.name} ({size:,} bytes)")
             old_book.unlink()
+            # process_epub.py's diagnostic manifest, if one was written beside it
+            old_book.with_name(old_book.stem + ".diagnostics.json").unlink(missing_ok=True)
             removed.append(old_book.name)
         except Exception as e:
             log.error(f"  Failed to remove {old_book.name}: {e}")
@@ -9,23 +9,42 @@ Usage:
     python generate_opds.py
 
 Output:
-    opds.xml - OPDS catalog feed
+    opds.xml - OPDS catalog feed (first page of all issues)
+    opds/index.xml - Navigation root with per-month and per-section facets
+    opds/*.xml - Further pages and facet feeds
+    opds/manifest.json - Content hashes and sizes of every published file
+    *.gz, *.br - Precompressed siblings of each feed and health.json
+                 (.br only when the brotli package is installed)
     health.json - System health check endpoint
+    books/index.json - Persistent book metadata index (rescans only changed files)
 
 Environment Variables:
     BLOOMBERG_DEBUG - Set to '1', 'true', or 'yes' for verbose logging
     OPDS_BASE_URL - Base URL for absolute links (optional)
+    OPDS_PAGE_SIZE - Entries per acquisition feed page (default: 25)
 """
 
+import io
 import os
 import re
 import sys
+import gzip
 import json
+import shutil
 import hashlib
 import logging
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from xml.sax.saxutils import escape as xml_escape
+from xml.sax.saxutils import XMLGenerator
+
+try:
+    import brotli
+except ImportError:  # Optional: .br variants are skipped without it
+    brotli = None
 
 # ============================================================================
 # Logging Configuration
@@ -50,36 +69,221 @@ if DEBUG:
 SCRIPT_DIR = Path(__file__).parent
 BOOKS_DIR = SCRIPT_DIR / "books"
 OPDS_OUTPUT = SCRIPT_DIR / "opds.xml"
+FEEDS_DIR = SCRIPT_DIR / "opds"
 HEALTH_OUTPUT = SCRIPT_DIR / "health.json"
+MANIFEST_FILE = FEEDS_DIR / "manifest.json"
+MANIFEST_VERSION = 2
+INDEX_FILE = BOOKS_DIR / "index.json"
+INDEX_VERSION = 5
 BASE_URL = os.environ.get("OPDS_BASE_URL", "https://mylesmcook.github.io/bloomberg-daily/")
+PAGE_SIZE = max(1, int(os.environ.get("OPDS_PAGE_SIZE", "25")))
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+EPOCH_TIMESTAMP = "1970-01-01T00:00:00Z"
+
+# Sections every issue carries (see ALLOWED_SECTIONS in the recipe)
+DEFAULT_SECTIONS = ['AI', 'Technology', 'Industries', 'Latest']
+
+ACQUISITION_TYPE = "application/atom+xml;profile=opds-catalog;kind=acquisition"
+NAVIGATION_TYPE = "application/atom+xml;profile=opds-catalog;kind=navigation"
+FACET_REL = "http://opds-spec.org/facet"
+
+# Headlines shown in each entry's summary
+HEADLINE_COUNT = 5
+
+OPF_NS = "http://www.idpf.org/2007/opf"
+NCX_NS = "http://www.daisy.org/z3986/2005/ncx/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+@contextmanager
+def atomic_write(path):
+    """
+    Open a temp file beside path for binary writing; rename it over path
+    only if the block completes, so readers never see a partial file.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_index():
+    """Load the persistent book metadata index (empty if missing or stale)."""
+    try:
+        index = json.loads(INDEX_FILE.read_text(encoding='utf-8'))
+        if index.get("version") == INDEX_VERSION:
+            return index
+        log.info(f"Index version changed, rebuilding: {INDEX_FILE}")
+    except FileNotFoundError:
+        log.debug(f"No index yet: {INDEX_FILE}")
+    except (OSError, ValueError) as e:
+        log.warning(f"Ignoring unreadable index {INDEX_FILE}: {e}")
+    return {"version": INDEX_VERSION, "books": {}}
+
+
+def save_index(index):
+    """Write the index atomically."""
+    with atomic_write(INDEX_FILE) as f:
+        f.write(json.dumps(index, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_epub_metadata(book_path):
+    """
+    Read issue metadata from an EPUB's OPF and toc.ncx.
+
+    Only the central directory, container.xml, the OPF and the NCX are
+    read; article bodies and images are never decompressed. Returns a dict
+    with published (the OPF dc:date), sections (top-level TOC labels),
+    article_counts ({section: articles}), article_count and headlines.
+    """
+    with zipfile.ZipFile(book_path) as zf:
+        container = ET.fromstring(zf.read('META-INF/container.xml'))
+        rootfile = container.find('.//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile')
+        opf_path = rootfile.get('full-path')
+        opf = ET.fromstring(zf.read(opf_path))
+
+        date_el = opf.find(f'.//{{{DC_NS}}}date')
+        published = date_el.text.strip() if date_el is not None and date_el.text else None
+
+        ncx_item = next((item for item in opf.iter(f'{{{OPF_NS}}}item')
+                         if item.get('media-type') == 'application/x-dtbncx+xml'), None)
+        if ncx_item is None:
+            raise ValueError("no NCX table of contents in OPF manifest")
+        ncx_path = posixpath.normpath(posixpath.join(posixpath.dirname(opf_path), ncx_item.get('href')))
+        ncx = ET.fromstring(zf.read(ncx_path))
+
+    def label(point):
+        text = point.find(f'{{{NCX_NS}}}navLabel/{{{NCX_NS}}}text')
+        return ' '.join((text.text or '').split()) if text is not None else ''
+
+    # Calibre news TOCs are section > article; a flat TOC lists articles only
+    article_counts = {}
+    section_articles = []
+    for point in ncx.findall(f'{{{NCX_NS}}}navMap/{{{NCX_NS}}}navPoint'):
+        children = [label(child) for child in point.findall(f'{{{NCX_NS}}}navPoint')]
+        if children:
+            article_counts[label(point)] = len(children)
+            section_articles.append(children)
+        else:
+            section_articles.append([label(point)])
+
+    # Lead with each section's top story, then round-robin
+    headlines = []
+    for rank in range(max((len(a) for a in section_articles), default=0)):
+        headlines += [articles[rank] for articles in section_articles if rank < len(articles)]
+        if len(headlines) >= HEADLINE_COUNT:
+            break
+
+    return {
+        "published": published,
+        "sections": list(article_counts),
+        "article_counts": article_counts,
+        "article_count": sum(len(a) for a in section_articles),
+        "headlines": [h for h in headlines if h][:HEADLINE_COUNT],
+    }
+
+
+def build_book_record(book_path, stat, sha256=None):
+    """Collect metadata for one EPUB (only called for new or changed files)."""
+    record = {
+        "filename": book_path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or file_sha256(book_path),
+        "date": extract_date_from_filename(book_path.name),
+        "title": format_title(book_path.name),
+        "published": None,
+        "sections": list(DEFAULT_SECTIONS),
+        "article_counts": {},
+        "article_count": None,
+        "headlines": [],
+    }
+    try:
+        record.update(read_epub_metadata(book_path))
+    except (zipfile.BadZipFile, ET.ParseError, KeyError, ValueError, AttributeError, TypeError) as e:
+        log.warning(f"Could not read TOC/OPF metadata from {book_path.name}: {e}")
+    if not record["sections"]:
+        record["sections"] = list(DEFAULT_SECTIONS)
+    return record
+
+
 def get_books():
-    """Get list of EPUB files sorted by date (newest first)."""
+    """
+    Return a snapshot of book metadata sorted by date (newest first).
+
+    Metadata comes from the persistent index keyed by filename, so each
+    EPUB is opened once in its lifetime. A book whose size and mtime match
+    its record is reused on a stat alone. If only the mtime differs, the
+    file is hashed and reused when its sha256 still matches; the new mtime
+    is kept but never by itself rewrites the index, which is committed with
+    books/. The trade-off: a fresh checkout (every CI run) resets mtimes,
+    so there each book is hashed once per run until the index is next
+    saved. Each record is a dict with filename, path, size, mtime_ns,
+    sha256, date, title, published, sections, article_counts,
+    article_count and headlines.
+    """
     log.debug(f"Scanning for EPUBs in: {BOOKS_DIR}")
 
     if not BOOKS_DIR.exists():
         log.warning(f"Books directory does not exist: {BOOKS_DIR}")
         return []
 
-    epubs = list(BOOKS_DIR.glob("*.epub"))
-    log.debug(f"Found {len(epubs)} EPUB files")
-
-    def extract_date(path):
-        match = re.search(r'(\d{4}-\d{2}-\d{2})', path.name)
-        if match:
-            return match.group(1)
-        return "0000-00-00"
+    index = load_index()
+    indexed = index["books"]
+    books = {}
+    rescanned = 0
+    hashed = 0
+
+    for path in BOOKS_DIR.glob("*.epub"):
+        stat = path.stat()
+        record = indexed.get(path.name)
+        sha256 = None
+        if record and record["size"] == stat.st_size:
+            if record.get("mtime_ns") == stat.st_mtime_ns:
+                books[path.name] = record
+                continue
+            # Touched, e.g. by a checkout: only the content decides
+            sha256 = file_sha256(path)
+            hashed += 1
+            if record["sha256"] == sha256:
+                books[path.name] = dict(record, mtime_ns=stat.st_mtime_ns)
+                continue
+        books[path.name] = build_book_record(path, stat, sha256)
+        rescanned += 1
+
+    log.debug(f"Found {len(books)} EPUB files ({rescanned} new or changed, {hashed} re-hashed)")
+
+    if rescanned or set(books) != set(indexed):
+        index["books"] = books
+        try:
+            save_index(index)
+        except OSError as e:
+            log.warning(f"Failed to save index {INDEX_FILE}: {e}")
 
-    sorted_books = sorted(epubs, key=extract_date, reverse=True)
+    snapshot = [dict(record, path=BOOKS_DIR / name) for name, record in books.items()]
+    snapshot.sort(key=lambda b: b["date"] or "0000-00-00", reverse=True)
 
-    for book in sorted_books:
-        log.debug(f"  - {book.name} (date: {extract_date(book)})")
+    for book in snapshot:
+        log.debug(f"  - {book['filename']} (date: {book['date']}, articles: {book['article_count']})")
 
-    return sorted_books
+    return snapshot
 
 
 def format_title(filename):
@@ -105,101 +309,431 @@ def extract_date_from_filename(filename):
     return match.group(1) if match else None
 
 
+# ============================================================================
+# Published Output
+# ============================================================================
+
+def load_output_manifest():
+    """Load the content-hash manifest of published files (empty if missing or stale)."""
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding='utf-8'))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        log.warning(f"Ignoring unreadable manifest {MANIFEST_FILE}: {e}")
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+
+def save_output_manifest(manifest):
+    with atomic_write(MANIFEST_FILE) as f:
+        f.write((json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode('utf-8'))
+
+
+def compressed_path(path, suffix):
+    return path.with_name(f"{path.name}.{suffix}")
+
+
+def write_compressed_variants(path):
+    """
+    Write path.gz (and path.br when brotli is installed) beside path.
+
+    The gzip header carries no name or timestamp, so identical input always
+    yields identical bytes. Returns {"gz": size, "br": size}.
+    """
+    sizes = {}
+    with open(path, 'rb') as src, atomic_write(compressed_path(path, 'gz')) as f:
+        with gzip.GzipFile(filename='', fileobj=f, mode='wb', compresslevel=9, mtime=0) as gz:
+            shutil.copyfileobj(src, gz)
+        sizes["gz"] = f.tell()
+
+    br_path = compressed_path(path, 'br')
+    if brotli is None:
+        # Never leave a .br that no longer matches its source
+        br_path.unlink(missing_ok=True)
+        return sizes
+
+    compressor = brotli.Compressor(quality=11)
+    with open(path, 'rb') as src, atomic_write(br_path) as f:
+        for chunk in iter(lambda: src.read(64 * 1024), b''):
+            f.write(compressor.process(chunk))
+        f.write(compressor.finish())
+        sizes["br"] = f.tell()
+    return sizes
+
+
+def publish(rel_path, write, manifest):
+    """
+    Write one published file via write(f), then add its compressed siblings.
+
+    The content goes to a temp file first. If its hash matches the manifest
+    entry and the published files are all present, the temp file is
+    discarded and nothing on disk changes, so an unchanged catalog produces
+    no git diff. Returns the file's size in bytes.
+    """
+    path = output_path(rel_path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+            size = f.tell()
+
+        sha256 = file_sha256(tmp_path)
+        entry = manifest["files"].get(rel_path)
+        siblings = [compressed_path(path, suffix) for suffix in (("gz", "br") if brotli else ("gz",))]
+        if entry and entry["sha256"] == sha256 and path.exists() and all(p.exists() for p in siblings):
+            tmp_path.unlink()
+            log.debug(f"  Unchanged: {rel_path}")
+            return size
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    manifest["files"][rel_path] = {"sha256": sha256, "etag": f'"{sha256[:32]}"', "size": size,
+                                   **write_compressed_variants(path)}
+    log.debug(f"  Updated: {rel_path}")
+    return size
+
+
+def remove_stale_feeds(manifest, keep):
+    """Delete feed pages (and their siblings) not produced by this run."""
+    keep_paths = {output_path(rel_path) for rel_path in keep}
+    for stale in FEEDS_DIR.glob("*.xml"):
+        if stale not in keep_paths:
+            log.debug(f"  Removing stale feed: {stale.name}")
+            for path in (stale, compressed_path(stale, 'gz'), compressed_path(stale, 'br')):
+                path.unlink(missing_ok=True)
+    for rel_path in list(manifest["files"]):
+        if rel_path not in keep:
+            del manifest["files"][rel_path]
+
+
 # ============================================================================
 # OPDS Generation
 # ============================================================================
 
-def generate_entry(book_path):
-    """Generate OPDS entry XML for a single book."""
-    log.debug(f"Generating entry for: {book_path.name}")
+def content_timestamp(book):
+    """
+    Timestamp for a book derived from the issue itself, not the filesystem:
+    its OPF dc:date (set when the issue was built), else the issue date,
+    else the Unix epoch. Stable across checkouts; changes only on rebuild.
+    """
+    if book.get("published"):
+        try:
+            published = datetime.fromisoformat(book["published"])
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            return published.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        except ValueError:
+            log.debug(f"  Unparseable dc:date in {book['filename']}: {book['published']}")
+    if book["date"]:
+        return f"{book['date']}T00:00:00Z"
+    return EPOCH_TIMESTAMP
+
+
+def book_etag(book):
+    """Strong ETag for a book, from its content hash."""
+    return f'"{book["sha256"][:32]}"'
+
+
+def entry_fields(book):
+    """Derive the values an OPDS entry needs from a book record."""
+    log.debug(f"Preparing entry for: {book['filename']}")
 
     try:
-        stat = book_path.stat()
-        modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        size = stat.st_size
-        book_id = hashlib.md5(book_path.name.encode()).hexdigest()
-        title = format_title(book_path.name)
-
-        # URL for the book (absolute URL for maximum OPDS reader compatibility)
-        book_url = f"{BASE_URL}books/{book_path.name}"
-
-        # XML escape all dynamic content for safety
-        safe_title = xml_escape(title)
-        safe_url = xml_escape(book_url)
-
-        log.debug(f"  Title: {safe_title}, Size: {size}, ID: {book_id[:8]}...")
-
-        return f'''
-    <entry>
-        <title>{safe_title}</title>
-        <id>urn:uuid:{book_id}</id>
-        <updated>{modified}</updated>
-        <author>
-            <name>Bloomberg News</name>
-        </author>
-        <dc:publisher>Bloomberg L.P.</dc:publisher>
-        <category term="news" label="News"/>
-        <category term="technology" label="Technology"/>
-        <category term="business" label="Business"/>
-        <summary>AI, Technology, Industries, and Latest news from Bloomberg</summary>
-        <content type="text">AI · Technology · Industries · Latest</content>
-        <link href="{safe_url}" rel="http://opds-spec.org/acquisition" type="application/epub+zip" length="{size}"/>
-        <link href="{safe_url}" rel="http://opds-spec.org/acquisition/open-access" type="application/epub+zip"/>
-    </entry>'''
+        fields = {
+            "title": book["title"],
+            "id": f"urn:uuid:{hashlib.md5(book['filename'].encode()).hexdigest()}",
+            "updated": content_timestamp(book),
+            # Absolute URL for maximum OPDS reader compatibility
+            "url": f"{BASE_URL}books/{book['filename']}",
+            "size": str(book["size"]),
+            "published": book.get("published"),
+            "categories": [(slugify(name), name) for name in book["sections"]],
+        }
+
+        counts = book.get("article_counts") or {}
+        if book.get("headlines"):
+            fields["summary"] = f"{book['article_count']} articles. Top stories: " + "; ".join(book["headlines"])
+        else:
+            fields["summary"] = ", ".join(book["sections"]) + " news from Bloomberg"
+        fields["content"] = " · ".join(
+            f"{name} ({counts[name]})" if name in counts else name for name in book["sections"]
+        )
+
+        log.debug(f"  Title: {fields['title']}, Size: {fields['size']}, ID: {fields['id'][9:17]}...")
+        return fields
 
     except Exception as e:
-        log.error(f"Failed to generate entry for {book_path}")
-        log.error(f"  File exists: {book_path.exists()}")
+        log.error(f"Failed to generate entry for {book['filename']}")
+        log.error(f"  File exists: {book['path'].exists()}")
         log.error(f"  Exception: {e}")
         raise
 
 
-def generate_catalog():
-    """Generate complete OPDS catalog XML."""
-    log.info("Generating OPDS catalog...")
+def generate_entry(feed, fields):
+    """Write the OPDS entry for one book (see entry_fields)."""
+    feed.start("entry")
+    feed.element("title", fields["title"])
+    feed.element("id", fields["id"])
+    feed.element("updated", fields["updated"])
+    feed.start("author")
+    feed.element("name", "Bloomberg News")
+    feed.end("author")
+    feed.element("dc:publisher", "Bloomberg L.P.")
+    if fields["published"]:
+        feed.element("dc:date", fields["published"])
+    feed.element("category", attrs={"term": "news", "label": "News"})
+    for term, label in fields["categories"]:
+        feed.element("category", attrs={"term": term, "label": label})
+    feed.element("summary", fields["summary"])
+    feed.element("content", fields["content"], {"type": "text"})
+    feed.link(fields["url"], "http://opds-spec.org/acquisition", "application/epub+zip",
+              length=fields["size"])
+    feed.link(fields["url"], "http://opds-spec.org/acquisition/open-access", "application/epub+zip")
+    feed.end("entry")
+
+
+class FeedWriter:
+    """
+    Streams one Atom/OPDS feed document to a binary file with XMLGenerator.
+
+    Elements are written as they are produced, so memory use does not grow
+    with the number of entries.
+    """
+
+    NAMESPACES = {
+        "xmlns": "http://www.w3.org/2005/Atom",
+        "xmlns:dc": "http://purl.org/dc/terms/",
+        "xmlns:opds": "http://opds-spec.org/2010/catalog",
+        "xmlns:thr": "http://purl.org/syndication/thread/1.0",
+    }
+
+    def __init__(self, f):
+        # A buffered text layer; XMLGenerator's own wrapper writes through on every call
+        self.out = io.TextIOWrapper(f, encoding='utf-8', errors='xmlcharrefreplace', newline='\n')
+        self.xml = XMLGenerator(self.out, encoding='utf-8', short_empty_elements=True)
+        self.depth = 0
+
+    def _indent(self):
+        self.xml.ignorableWhitespace("\n" + "    " * self.depth)
+
+    def start(self, name, attrs=None):
+        self._indent()
+        self.xml.startElement(name, attrs or {})
+        self.depth += 1
+
+    def end(self, name):
+        self.depth -= 1
+        self._indent()
+        self.xml.endElement(name)
+
+    def element(self, name, text=None, attrs=None):
+        self._indent()
+        self.xml.startElement(name, attrs or {})
+        if text:
+            self.xml.characters(text)
+        self.xml.endElement(name)
+
+    def link(self, href, rel, link_type, title=None, **extra):
+        attrs = {"href": href, "rel": rel, "type": link_type}
+        if title:
+            attrs["title"] = title
+        attrs.update(extra)
+        self.element("link", attrs=attrs)
+
+    def start_feed(self, feed_id, title, subtitle, updated):
+        self.xml.startDocument()
+        self.xml.startElement("feed", self.NAMESPACES)
+        self.depth = 1
+        self.element("id", feed_id)
+        self.element("title", title)
+        self.element("subtitle", subtitle)
+        self.element("icon", "https://assets.bwbx.io/s3/javelin/public/hub/images/favicon-black-63fe5249d3.png")
+        self.element("updated", updated)
+        self.start("author")
+        self.element("name", "Bloomberg News Pipeline")
+        self.element("uri", "https://github.com/MylesMCook/bloomberg-daily")
+        self.end("author")
+
+    def end_feed(self):
+        self.end("feed")
+        self.xml.ignorableWhitespace("\n")
+        self.xml.endDocument()
+        self.out.flush()
+        self.out.detach()
+
+
+def feed_path(slug, page=1):
+    """Site-relative path of an acquisition feed page; page 1 of 'all' is opds.xml."""
+    if slug == "all" and page == 1:
+        return "opds.xml"
+    return f"opds/{slug}.xml" if page == 1 else f"opds/{slug}-{page}.xml"
+
+
+def output_path(rel_path):
+    """Filesystem path for a site-relative published path."""
+    if rel_path == "opds.xml":
+        return OPDS_OUTPUT
+    if rel_path == "health.json":
+        return HEALTH_OUTPUT
+    return FEEDS_DIR / Path(rel_path).name
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def month_label(month):
+    """'2026-02' -> 'February 2026'"""
+    return datetime.strptime(month, '%Y-%m').strftime('%B %Y')
+
+
+def build_facets(books):
+    """
+    Group books into per-month and per-section facets.
+
+    Returns a list of {"group", "title", "slug", "books"} dicts, months
+    newest first, then sections in their usual order.
+    """
+    months = {}
+    sections = {}
+    for book in books:
+        if book["date"]:
+            months.setdefault(book["date"][:7], []).append(book)
+        for section in book.get("sections") or []:
+            sections.setdefault(section, []).append(book)
+
+    section_order = {name: i for i, name in enumerate(DEFAULT_SECTIONS)}
+    facets = [
+        {"group": "Month", "title": month_label(month), "slug": f"month-{month}", "books": month_books}
+        for month, month_books in sorted(months.items(), reverse=True)
+    ]
+    facets += [
+        {"group": "Section", "title": section, "slug": f"section-{slugify(section)}", "books": section_books}
+        for section, section_books in sorted(sections.items(),
+                                             key=lambda kv: (section_order.get(kv[0], len(section_order)), kv[0]))
+    ]
+    return facets
+
+
+def issue_count_subtitle(count, archive=False):
+    if count == 0:
+        return "No issues available"
+    if count == 1:
+        return "1 issue available"
+    return f"{count} issues available" + (" (rolling weekly archive)" if archive else "")
+
+
+def write_feed(rel_path, write, manifest):
+    """Stream one feed file and publish it via write(feed); return its size in bytes."""
+    return publish(rel_path, lambda f: write(FeedWriter(f)), manifest)
+
+
+def feed_updated(books, fields):
+    """A feed's <updated>: the newest entry timestamp it covers (epoch when empty)."""
+    return max((fields[b["filename"]]["updated"] for b in books), default=EPOCH_TIMESTAMP)
+
+
+def generate_acquisition_pages(slug, title, books, fields, facets, manifest, active_slug=None):
+    """Write every page of one paginated acquisition feed; return {rel_path: bytes}."""
+    updated = feed_updated(books, fields)
+    page_count = max(1, -(-len(books) // PAGE_SIZE))
+    feed_id = "urn:uuid:bloomberg-daily-opds-feed" if slug == "all" else f"urn:bloomberg-daily:{slug}"
+    subtitle = issue_count_subtitle(len(books), archive=(slug == "all"))
+    written = {}
+
+    for page_no in range(1, page_count + 1):
+        page_books = books[(page_no - 1) * PAGE_SIZE:page_no * PAGE_SIZE]
+
+        def write(feed):
+            page_subtitle = f"{subtitle} - page {page_no} of {page_count}" if page_count > 1 else subtitle
+            feed.start_feed(feed_id, title, page_subtitle, updated)
+            feed.link(f"{BASE_URL}{feed_path(slug, page_no)}", "self", ACQUISITION_TYPE)
+            feed.link(f"{BASE_URL}opds/index.xml", "start", NAVIGATION_TYPE)
+            feed.link(f"{BASE_URL}{feed_path(slug)}", "first", ACQUISITION_TYPE)
+            feed.link(f"{BASE_URL}{feed_path(slug, page_count)}", "last", ACQUISITION_TYPE)
+            if page_no > 1:
+                feed.link(f"{BASE_URL}{feed_path(slug, page_no - 1)}", "previous", ACQUISITION_TYPE)
+            if page_no < page_count:
+                feed.link(f"{BASE_URL}{feed_path(slug, page_no + 1)}", "next", ACQUISITION_TYPE)
+
+            for facet in facets:
+                extra = {"opds:facetGroup": facet["group"], "thr:count": str(len(facet["books"]))}
+                if facet["slug"] == active_slug:
+                    extra["opds:activeFacet"] = "true"
+                feed.link(f"{BASE_URL}{feed_path(facet['slug'])}", FACET_REL, ACQUISITION_TYPE,
+                          facet["title"], **extra)
+
+            for book in page_books:
+                generate_entry(feed, fields[book["filename"]])
+            feed.end_feed()
+
+        rel_path = feed_path(slug, page_no)
+        written[rel_path] = write_feed(rel_path, write, manifest)
+
+    return written
+
+
+def generate_navigation_root(books, facets, fields, manifest):
+    """Write the navigation feed linking to all issues and every facet; return its size."""
+    targets = [{"group": None, "title": "All issues", "slug": "all", "books": books}] + facets
+
+    def write(feed):
+        feed.start_feed("urn:bloomberg-daily:navigation", "Bloomberg Daily Briefing",
+                        "Browse issues by month or section", feed_updated(books, fields))
+        feed.link(f"{BASE_URL}opds/index.xml", "self", NAVIGATION_TYPE)
+        feed.link(f"{BASE_URL}opds/index.xml", "start", NAVIGATION_TYPE)
+        for target in targets:
+            feed.start("entry")
+            feed.element("title", f"{target['group']}: {target['title']}" if target["group"] else target["title"])
+            feed.element("id", f"urn:bloomberg-daily:{target['slug']}")
+            feed.element("updated", feed_updated(target["books"], fields))
+            feed.element("content", issue_count_subtitle(len(target["books"])), {"type": "text"})
+            feed.link(f"{BASE_URL}{feed_path(target['slug'])}", "subsection", ACQUISITION_TYPE)
+            feed.end("entry")
+        feed.end_feed()
+
+    return write_feed("opds/index.xml", write, manifest)
+
+
+def generate_catalog(books, manifest):
+    """
+    Write the full OPDS catalog from a get_books() snapshot.
 
-    books = get_books()
-    now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    Produces opds.xml (first page of all issues), further pages, per-month
+    and per-section facet feeds, and the opds/index.xml navigation root.
+    Every file is streamed to a temp file and published (see publish());
+    feed pages left over from earlier runs are removed by main(). Returns
+    {rel_path: bytes}.
+    """
+    log.info("Generating OPDS catalog...")
 
-    entries = []
+    # Derive entry values once; a book can appear in several feeds
+    fields = {}
     for book in books:
         try:
-            entry = generate_entry(book)
-            entries.append(entry)
+            fields[book["filename"]] = entry_fields(book)
         except Exception as e:
-            log.error(f"Skipping {book.name} due to error: {e}")
-
-    # Count for subtitle
-    book_count = len(entries)
-    if book_count == 0:
-        subtitle = "No issues available"
-    elif book_count == 1:
-        subtitle = "1 issue available"
-    else:
-        subtitle = f"{book_count} issues available (rolling weekly archive)"
-
-    log.info(f"Generated {book_count} entries")
-
-    catalog = f'''<?xml version="1.0" encoding="UTF-8"?>
-<feed xmlns="http://www.w3.org/2005/Atom"
-      xmlns:dc="http://purl.org/dc/terms/"
-      xmlns:opds="http://opds-spec.org/2010/catalog">
-
-    <id>urn:uuid:bloomberg-daily-opds-feed</id>
-    <title>Bloomberg Daily Briefing</title>
-    <subtitle>{xml_escape(subtitle)}</subtitle>
-    <icon>https://assets.bwbx.io/s3/javelin/public/hub/images/favicon-black-63fe5249d3.png</icon>
-    <updated>{now}</updated>
-    <author>
-        <name>Bloomberg News Pipeline</name>
-        <uri>https://github.com/MylesMCook/bloomberg-daily</uri>
-    </author>
-
-    <link href="{BASE_URL}opds.xml" rel="self" type="application/atom+xml;profile=opds-catalog;kind=acquisition"/>
-    <link href="{BASE_URL}opds.xml" rel="start" type="application/atom+xml;profile=opds-catalog;kind=acquisition"/>
-    {''.join(entries)}
-</feed>'''
-
+            log.error(f"Skipping {book['filename']} due to error: {e}")
+    books = [b for b in books if b["filename"] in fields]
+
+    log.info(f"Generated {len(fields)} entries")
+
+    FEEDS_DIR.mkdir(parents=True, exist_ok=True)
+    facets = build_facets(books)
+    catalog = generate_acquisition_pages("all", "Bloomberg Daily Briefing", books, fields, facets, manifest)
+    for facet in facets:
+        catalog.update(generate_acquisition_pages(
+            facet["slug"], f"Bloomberg Daily Briefing - {facet['title']}",
+            facet["books"], fields, facets, manifest, active_slug=facet["slug"]
+        ))
+    catalog["opds/index.xml"] = generate_navigation_root(books, facets, fields, manifest)
+
+    log.info(f"Generated {len(catalog)} feed files ({len(facets)} facets, page size {PAGE_SIZE})")
     return catalog
 
 
@@ -207,20 +741,18 @@ def generate_catalog():
 # Health Check Generation
 # ============================================================================
 
-def generate_health_check():
+def generate_health_check(books):
     """Generate health.json for quick system status verification."""
     log.info("Generating health check...")
 
-    books = get_books()
-    now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-
-    total_size = sum(b.stat().st_size for b in books) if books else 0
-    dates = [extract_date_from_filename(b.name) for b in books]
-    dates = [d for d in dates if d]  # Filter out None
+    total_size = sum(b["size"] for b in books)
+    dates = [b["date"] for b in books if b["date"]]
 
     health = {
         "status": "ok" if books else "empty",
-        "last_update": now,
+        # When the newest content changed, not when this script ran, so an
+        # unchanged archive produces an identical file
+        "last_update": max((content_timestamp(b) for b in books), default=None),
         "book_count": len(books),
         "oldest_book": min(dates) if dates else None,
         "newest_book": max(dates) if dates else None,
@@ -229,10 +761,11 @@ def generate_health_check():
         "opds_url": f"{BASE_URL}opds.xml",
         "books": [
             {
-                "filename": b.name,
-                "date": extract_date_from_filename(b.name),
-                "size_bytes": b.stat().st_size,
-                "title": format_title(b.name)
+                "filename": b["filename"],
+                "date": b["date"],
+                "size_bytes": b["size"],
+                "title": b["title"],
+                "etag": book_etag(b)
             }
             for b in books
         ]
@@ -260,21 +793,41 @@ def main():
         log.info(f"Found {len(books)} EPUB(s)")
 
         for book in books:
-            size_mb = book.stat().st_size / 1024 / 1024
-            log.info(f"  - {book.name} ({size_mb:.1f} MB)")
+            size_mb = book["size"] / 1024 / 1024
+            log.info(f"  - {book['filename']} ({size_mb:.1f} MB)")
 
-        catalog = generate_catalog()
+        manifest = load_output_manifest()
+        previous = dict(manifest["files"])
 
-        # Write OPDS catalog
-        OPDS_OUTPUT.write_text(catalog, encoding='utf-8')
-        log.info(f"OPDS catalog written: {OPDS_OUTPUT}")
-        log.info(f"Catalog size: {len(catalog)} bytes")
+        # Generate and write OPDS catalog
+        catalog = generate_catalog(books, manifest)
+        log.info(f"OPDS catalog written: {OPDS_OUTPUT} (+ {len(catalog) - 1} files in {FEEDS_DIR})")
+        log.info(f"Catalog size: {sum(catalog.values())} bytes")
 
         # Generate and write health check
-        health = generate_health_check()
-        HEALTH_OUTPUT.write_text(json.dumps(health, indent=2), encoding='utf-8')
+        health = generate_health_check(books)
+        publish("health.json", lambda f: f.write(json.dumps(health, indent=2).encode('utf-8')), manifest)
         log.info(f"Health check written: {HEALTH_OUTPUT}")
 
+        # Books are served as-is; record their ETags for conditional requests
+        for book in books:
+            manifest["files"][f"books/{book['filename']}"] = {
+                "sha256": book["sha256"],
+                "etag": book_etag(book),
+                "size": book["size"],
+                "updated": content_timestamp(book),
+            }
+
+        # Drop old pages, then record hashes for the files that changed
+        published = set(catalog) | {"health.json"} | {f"books/{b['filename']}" for b in books}
+        remove_stale_feeds(manifest, keep=published)
+        changed = sorted(rel for rel in set(previous) | set(manifest["files"])
+                         if previous.get(rel) != manifest["files"].get(rel))
+        if changed:
+            save_output_manifest(manifest)
+        log.info(f"Manifest lists {len(manifest['files'])} files, {len(changed)} changed"
+                 f"{'' if brotli else ' (brotli not installed, .br skipped)'}")
+
         log.info("=" * 60)
         log.info("Generation complete!")
         log.info("=" * 60)
@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""
+OPDS Server for Bloomberg Daily
+
+Serves the static catalog (opds.xml, opds/, health.json, index.html) and
+the EPUBs in books/ over HTTP/1.1 using only asyncio. Books support Range
+requests for resumable downloads and are sent with loop.sendfile()
+(os.sendfile where available); catalog files are kept in a small in-memory
+LRU and served precompressed when the client accepts gzip or brotli. All
+responses carry ETag/Last-Modified and honour If-None-Match and
+If-Modified-Since.
+
+POST /upload accepts the same request as the workflow's curl upload
+(X-Upload-Secret header, multipart field "file") and regenerates the
+catalog afterwards.
+
+Usage:
+    python opds_server.py [--host HOST] [--port PORT]
+
+Environment Variables:
+    BLOOMBERG_DEBUG - Set to '1', 'true', or 'yes' for verbose logging
+    OPDS_HOST - Interface to bind (default: 0.0.0.0)
+    PORT - Port to listen on (default: 8080)
+    OPDS_UPLOAD_SECRET - Shared secret for POST /upload (uploads disabled if unset)
+    OPDS_MAX_UPLOAD_MB - Largest accepted upload (default: 50)
+    OPDS_CACHE_MB - Memory budget for cached catalog files (default: 8)
+"""
+
+import os
+import re
+import sys
+import hmac
+import json
+import asyncio
+import logging
+import zipfile
+import argparse
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+
+import generate_opds
+
+# ============================================================================
+# Logging Configuration
+# ============================================================================
+
+DEBUG = os.environ.get('BLOOMBERG_DEBUG', '').lower() in ('1', 'true', 'yes')
+
+logging.basicConfig(
+    level=logging.DEBUG if DEBUG else logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+log = logging.getLogger('opds_server')
+
+if DEBUG:
+    log.debug("Debug mode enabled")
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+HOST = os.environ.get("OPDS_HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "8080"))
+UPLOAD_SECRET = os.environ.get("OPDS_UPLOAD_SECRET", "")
+MAX_UPLOAD_BYTES = int(os.environ.get("OPDS_MAX_UPLOAD_MB", "50")) * 1024 * 1024
+CACHE_MAX_BYTES = int(os.environ.get("OPDS_CACHE_MB", "8")) * 1024 * 1024
+
+MAX_HEADER_BYTES = 16 * 1024
+IDLE_TIMEOUT = 15  # Seconds to wait for the next request on a kept-alive connection
+CHUNK_SIZE = 64 * 1024
+
+SAFE_NAME = r'[A-Za-z0-9][A-Za-z0-9._-]*'
+CONTENT_TYPES = {
+    ".xml": "application/atom+xml;profile=opds-catalog;charset=utf-8",
+    ".json": "application/json",
+    ".html": "text/html; charset=utf-8",
+    ".epub": "application/epub+zip",
+}
+ENCODINGS = [("br", "br"), ("gzip", "gz")]  # (Content-Encoding, sibling suffix), preferred first
+
+
+class HTTPError(Exception):
+    """Abort the current request with an error status."""
+
+    def __init__(self, status, message=None, close=False):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+        self.close = close
+
+
+# ============================================================================
+# Static Files
+# ============================================================================
+
+def resolve_path(target):
+    """
+    Map a request target to (rel_path, file path), or None.
+
+    Only published catalog files and books are exposed; anything else,
+    including temp files and the metadata index, is a 404.
+    """
+    rel_path = urllib.parse.unquote(urllib.parse.urlsplit(target).path).lstrip('/') or "index.html"
+
+    if rel_path in ("opds.xml", "health.json"):
+        return rel_path, generate_opds.output_path(rel_path)
+    if rel_path == "index.html":
+        return rel_path, generate_opds.SCRIPT_DIR / "index.html"
+    if re.fullmatch(rf'opds/{SAFE_NAME}\.xml', rel_path):
+        return rel_path, generate_opds.output_path(rel_path)
+    if re.fullmatch(rf'books/{SAFE_NAME}\.epub', rel_path):
+        return rel_path, generate_opds.BOOKS_DIR / rel_path.split('/', 1)[1]
+    return None
+
+
+def stat_key(stat):
+    """Identity of a file version; atomic replaces change the inode."""
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class OutputManifest:
+    """The ETag manifest written by generate_opds, reloaded when it changes."""
+
+    def __init__(self):
+        self.key = None
+        self.files = {}
+
+    def get(self, rel_path):
+        try:
+            stat = generate_opds.MANIFEST_FILE.stat()
+        except FileNotFoundError:
+            self.key, self.files = None, {}
+            return None
+        if stat_key(stat) != self.key:
+            try:
+                self.files = json.loads(generate_opds.MANIFEST_FILE.read_text(encoding='utf-8')).get("files", {})
+            except (OSError, ValueError) as e:
+                log.warning(f"Ignoring unreadable manifest: {e}")
+                self.files = {}
+            self.key = stat_key(stat)
+        return self.files.get(rel_path)
+
+
+class CatalogCache:
+    """
+    Byte-bounded LRU of small catalog files and their precompressed siblings.
+
+    Entries are validated against the file's inode/mtime/size on every hit,
+    so a regenerated catalog is picked up on the next request.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, stat):
+        entry = self.entries.get(path)
+        if entry and entry["key"] == stat_key(stat):
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        bodies = {"identity": path.read_bytes()}
+        for encoding, suffix in ENCODINGS:
+            sibling = path.with_name(f"{path.name}.{suffix}")
+            try:
+                # Siblings are written after their source; an older one is stale
+                if sibling.stat().st_mtime_ns >= stat.st_mtime_ns:
+                    bodies[encoding] = sibling.read_bytes()
+            except FileNotFoundError:
+                pass
+
+        self.discard(path)
+        entry = {"key": stat_key(stat), "bodies": bodies, "size": sum(len(b) for b in bodies.values())}
+        if entry["size"] <= self.max_bytes:
+            self.entries[path] = entry
+            self.size += entry["size"]
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted["size"]
+        return entry
+
+    def discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry:
+            self.size -= entry["size"]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+def file_etag(rel_path, stat, manifest):
+    """Content ETag from the manifest, else one derived from size and mtime."""
+    entry = manifest.get(rel_path)
+    if entry and entry.get("etag") and entry.get("size") == stat.st_size:
+        return entry["etag"]
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def choose_encoding(accept_encoding, available):
+    """Pick the preferred precompressed variant the client accepts."""
+    accepted = set()
+    for token in accept_encoding.split(','):
+        name, _, params = token.strip().partition(';')
+        if params.strip().replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(name.strip().lower())
+    for encoding, _ in ENCODINGS:
+        if encoding in available and (encoding in accepted or '*' in accepted):
+            return encoding
+    return "identity"
+
+
+def is_not_modified(headers, etag, mtime):
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110 13.2.2)."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        tags = [t.strip().removeprefix('W/') for t in if_none_match.split(',')]
+        return etag.removeprefix('W/') in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range 'bytes=' header into inclusive (start, end).
+
+    Returns None to serve the whole file (no header, multiple ranges, or a
+    unit we don't handle) and raises HTTPError(416) when unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or ',' in header:
+        return None
+    first, _, last = header[6:].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end and first and last:
+        return None  # Syntactically invalid: ignore, per RFC 9110
+    if start >= size or size == 0:
+        raise HTTPError(416)
+    return start, min(end, size - 1)
+
+
+# ============================================================================
+# HTTP Handling
+# ============================================================================
+
+def response_head(status, headers):
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+class OPDSServer:
+    """asyncio HTTP/1.1 server for the catalog, books and uploads."""
+
+    def __init__(self):
+        self.cache = CatalogCache(CACHE_MAX_BYTES)
+        self.manifest = OutputManifest()
+        self.regenerate_lock = asyncio.Lock()
+        self.requests = 0
+
+    async def send(self, writer, status, headers, body=b'', head=False, close=False):
+        headers = {
+            "Date": formatdate(usegmt=True),
+            "Server": "bloomberg-daily-opds",
+            **headers,
+            "Connection": "close" if close else "keep-alive",
+        }
+        headers.setdefault("Content-Length", str(len(body)))
+        writer.write(response_head(status, headers))
+        if body and not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def send_error(self, writer, status, message, head=False, close=False):
+        body = (json.dumps({"status": "error", "error": message}) + "\n").encode('utf-8')
+        await self.send(writer, status, {"Content-Type": "application/json"}, body, head, close)
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send_error(writer, 431, "Request header too large", close=True)
+                    break
+
+                try:
+                    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                    method, target, version = request_line.split(' ')
+                except ValueError:
+                    await self.send_error(writer, 400, "Malformed request line", close=True)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, _, value = line.partition(':')
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                self.requests += 1
+
+                try:
+                    close = await self.dispatch(method, target, headers, reader, writer, close)
+                except HTTPError as e:
+                    close = close or e.close
+                    await self.send_error(writer, e.status, str(e), head=(method == "HEAD"), close=close)
+                log.debug(f"{peer[0] if peer else '-'} {method} {target}")
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            log.error(f"Unhandled error serving {peer}: {e}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, method, target, headers, reader, writer, close):
+        """Route one request; returns whether the connection must close."""
+        path = urllib.parse.urlsplit(target).path
+        if path == "/upload":
+            if method != "POST":
+                raise HTTPError(405)
+            return await self.handle_upload(headers, reader, writer, close)
+
+        if method not in ("GET", "HEAD"):
+            raise HTTPError(405, close=bool(headers.get("content-length", "0") != "0"))
+
+        resolved = resolve_path(target)
+        if resolved is None:
+            raise HTTPError(404)
+        rel_path, file_path = resolved
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise HTTPError(404)
+
+        head = method == "HEAD"
+        if file_path.suffix == ".epub":
+            await self.send_book(writer, rel_path, file_path, stat, headers, head, close)
+        else:
+            await self.send_catalog(writer, rel_path, file_path, stat, headers, head, close)
+        return close
+
+    async def send_catalog(self, writer, rel_path, file_path, stat, headers, head, close):
+        entry = self.cache.get(file_path, stat)
+        encoding = choose_encoding(headers.get("accept-encoding", ""), entry["bodies"])
+        etag = file_etag(rel_path, stat, self.manifest)
+        if encoding != "identity":
+            etag = f'{etag[:-1]}-{encoding}"'
+
+        response_headers = {
+            "Content-Type": CONTENT_TYPES.get(file_path.suffix, "application/octet-stream"),
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if is_not_modified(headers, etag, stat.st_mtime):
+            await self.send(writer, 304, response_headers, head=True, close=close)
+            return
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+        await self.send(writer, 200, response_headers, entry["bodies"][encoding], head, close)
+
+    async def send_book(self, writer, rel_path, file_path, stat, headers, head, close):
+        etag = file_etag(rel_path, stat, self.manifest)
+        response_headers = {
+            "Content-Type": CONTENT_TYPES[".epub"],
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "public, max-age=86400",
+        }
+        if is_not_modified(headers, etag, stat.st_mtime):
+            await self.send(writer, 304, response_headers, head=True, close=close)
+            return
+
+        size = stat.st_size
+        byte_range = None
+        if_range = headers.get("if-range")
+        if if_range is None or if_range == etag:
+            try:
+                byte_range = parse_range(headers.get("range"), size)
+            except HTTPError:
+                response_headers["Content-Range"] = f"bytes */{size}"
+                await self.send(writer, 416, response_headers, close=close)
+                return
+
+        status, start, length = 200, 0, size
+        if byte_range:
+            start, end = byte_range
+            status, length = 206, end - start + 1
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response_headers["Content-Length"] = str(length)
+
+        await self.send(writer, status, response_headers, head=True, close=close)
+        if head or not length:
+            return
+        with open(file_path, 'rb') as f:
+            await asyncio.get_running_loop().sendfile(writer.transport, f, offset=start, count=length)
+
+    async def handle_upload(self, headers, reader, writer, close):
+        """Store an uploaded EPUB in books/ and regenerate the catalog."""
+        length = headers.get("content-length")
+        must_close = length is None or length != "0"
+
+        if not UPLOAD_SECRET:
+            raise HTTPError(503, "Uploads are disabled (OPDS_UPLOAD_SECRET not set)", close=must_close)
+        if not hmac.compare_digest(headers.get("x-upload-secret", "").encode(), UPLOAD_SECRET.encode()):
+            raise HTTPError(401, "Invalid upload secret", close=must_close)
+        if length is None or not length.isdigit():
+            raise HTTPError(411, close=True)
+        if int(length) > MAX_UPLOAD_BYTES:
+            raise HTTPError(413, f"Upload exceeds {MAX_UPLOAD_BYTES // 1024 // 1024} MB", close=True)
+
+        match = re.search(r'boundary="?([^";]+)"?', headers.get("content-type", ""))
+        if not headers.get("content-type", "").startswith("multipart/form-data") or not match:
+            raise HTTPError(400, "Expected multipart/form-data", close=True)
+
+        books_dir = generate_opds.BOOKS_DIR
+        books_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = books_dir / f".upload-{os.getpid()}-{id(writer):x}.tmp"
+        body = BodyReader(reader, int(length))
+        try:
+            with open(tmp_path, 'wb') as f:
+                filename = await read_multipart_file(body, match.group(1).encode('latin-1'), f)
+            await body.drain()
+
+            name = Path(filename or "").name
+            if not re.fullmatch(rf'{SAFE_NAME}\.epub', name):
+                raise HTTPError(400, "Missing 'file' field or not an .epub filename")
+            if not zipfile.is_zipfile(tmp_path):
+                raise HTTPError(400, "Uploaded file is not a valid EPUB (zip)")
+
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, books_dir / name)
+        except ValueError as e:
+            raise HTTPError(400, str(e), close=True)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        log.info(f"Upload stored: {name} ({size:,} bytes)")
+        await self.regenerate_catalog()
+
+        body = (json.dumps({"status": "ok", "filename": name, "size": size}) + "\n").encode('utf-8')
+        await self.send(writer, 200, {"Content-Type": "application/json"}, body, close=close)
+        return close
+
+    async def regenerate_catalog(self):
+        """Run generate_opds off the event loop, one run at a time."""
+        async with self.regenerate_lock:
+            started = datetime.now(timezone.utc)
+            await asyncio.get_running_loop().run_in_executor(None, generate_opds.main)
+            self.cache.clear()
+            log.info(f"Catalog regenerated in {(datetime.now(timezone.utc) - started).total_seconds():.2f}s")
+
+
+# ============================================================================
+# Multipart Upload Parsing
+# ============================================================================
+
+class BodyReader:
+    """Reads exactly Content-Length bytes of a request body in chunks."""
+
+    def __init__(self, reader, length):
+        self.reader = reader
+        self.remaining = length
+
+    async def read(self):
+        if self.remaining <= 0:
+            return b''
+        chunk = await self.reader.read(min(CHUNK_SIZE, self.remaining))
+        if not chunk:
+            raise ConnectionError("client closed connection mid-body")
+        self.remaining -= len(chunk)
+        return chunk
+
+    async def drain(self):
+        while await self.read():
+            pass
+
+
+async def read_multipart_file(body, boundary, dest):
+    """
+    Stream the part named "file" of a multipart/form-data body into dest.
+
+    Other parts are skipped. Returns the part's filename, or None if the
+    body had no "file" part. Raises ValueError on a malformed body.
+    """
+    delimiter = b'\r\n--' + boundary
+    buf = b'\r\n'  # The first boundary has no leading CRLF
+    filename = None
+
+    while True:
+        # Skip to the next boundary
+        while (pos := buf.find(delimiter)) < 0:
+            chunk = await body.read()
+            if not chunk:
+                return filename
+            buf = buf[-len(delimiter):] + chunk
+        buf = buf[pos + len(delimiter):]
+        while len(buf) < 2:
+            chunk = await body.read()
+            if not chunk:
+                raise ValueError("Truncated multipart body")
+            buf += chunk
+        if buf.startswith(b'--'):
+            return filename
+
+        while (end := buf.find(b'\r\n\r\n')) < 0:
+            chunk = await body.read()
+            if not chunk or len(buf) > MAX_HEADER_BYTES:
+                raise ValueError("Malformed multipart part headers")
+            buf += chunk
+        part_headers = buf[:end].decode('utf-8', 'replace')
+        buf = buf[end + 4:]
+
+        disposition = re.search(r'(?im)^content-disposition:(.*)$', part_headers)
+        disposition = disposition.group(1) if disposition else ""
+        name = re.search(r'(?:^|;)\s*name="([^"]*)"', disposition)
+        if filename is not None or not name or name.group(1) != "file":
+            continue
+        part_filename = re.search(r'filename="([^"]*)"', disposition)
+        filename = part_filename.group(1) if part_filename else ""
+
+        # Copy the part body up to (not including) the next delimiter
+        keep = len(delimiter) - 1
+        while (pos := buf.find(delimiter)) < 0:
+            if len(buf) > keep:
+                dest.write(buf[:-keep])
+                buf = buf[-keep:]
+            chunk = await body.read()
+            if not chunk:
+                raise ValueError("Truncated multipart body")
+            buf += chunk
+        dest.write(buf[:pos])
+        buf = buf[pos:]
+
+
+# ============================================================================
+# Main Entry Point
+# ============================================================================
+
+async def serve(host, port):
+    server = OPDSServer()
+    listener = await asyncio.start_server(server.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    addresses = ', '.join(str(sock.getsockname()) for sock in listener.sockets)
+    log.info(f"Serving {generate_opds.SCRIPT_DIR} on {addresses}")
+    log.info(f"Uploads: {'enabled' if UPLOAD_SECRET else 'disabled (set OPDS_UPLOAD_SECRET)'}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Bloomberg Daily OPDS catalog and books")
+    parser.add_argument("--host", default=HOST, help=f"Interface to bind (default: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        log.info("Server stopped")
+
+
+if __name__ == "__main__":
+    main()
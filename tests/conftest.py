@@ -0,0 +1,32 @@
+"""Shared fixtures: the recipe's module level, loaded without calibre."""
+
+import ast
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RECIPE = REPO_DIR / "bloomberg_filtered.recipe"
+sys.path.insert(0, str(REPO_DIR / "benchmarks"))
+
+
+def load_recipe():
+    """Exec the recipe's module level without calibre; apply_repeats comes along as a plain function."""
+    tree = ast.parse(RECIPE.read_text(encoding="utf-8"))
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module.startswith("calibre"):
+            continue
+        if isinstance(node, ast.ClassDef) and node.bases:
+            body += [n for n in node.body if isinstance(n, ast.FunctionDef) and n.name == "apply_repeats"]
+            continue
+        body.append(node)
+    namespace = {}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(RECIPE), "exec"), namespace)
+    return namespace
+
+
+@pytest.fixture(scope="session")
+def recipe():
+    return load_recipe()
@@ -0,0 +1,45 @@
+"""Tests for generate_opds.py."""
+
+import os
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(REPO_DIR / "benchmarks"))
+
+import generate_opds  # noqa: E402
+from synthetic_epub import make_archive  # noqa: E402
+
+
+def test_index_unchanged_after_checkout_touches_books(tmp_path, monkeypatch):
+    books_dir = tmp_path / "books"
+    make_archive(books_dir, 3)
+    monkeypatch.setattr(generate_opds, "BOOKS_DIR", books_dir)
+    monkeypatch.setattr(generate_opds, "INDEX_FILE", books_dir / "index.json")
+
+    generate_opds.get_books()
+    before = (books_dir / "index.json").read_bytes()
+    os.utime(books_dir / "index.json", (0, 0))
+
+    # A fresh checkout gives every book a new mtime
+    for book in books_dir.glob("*.epub"):
+        os.utime(book, (1_900_000_000, 1_900_000_000))
+    generate_opds.get_books()
+
+    assert (books_dir / "index.json").read_bytes() == before
+    assert (books_dir / "index.json").stat().st_mtime == 0
+
+
+def test_warm_run_does_not_hash(tmp_path, monkeypatch):
+    books_dir = tmp_path / "books"
+    make_archive(books_dir, 3)
+    monkeypatch.setattr(generate_opds, "BOOKS_DIR", books_dir)
+    monkeypatch.setattr(generate_opds, "INDEX_FILE", books_dir / "index.json")
+    generate_opds.get_books()
+
+    def fail(path):
+        raise AssertionError(f"{path.name} hashed on a warm run")
+
+    monkeypatch.setattr(generate_opds, "file_sha256", fail)
+    assert len(generate_opds.get_books()) == 3
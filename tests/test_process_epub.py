@@ -0,0 +1,104 @@
+"""Tests for process_epub.py."""
+
+import sys
+import json
+import concurrent.futures
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(REPO_DIR / "benchmarks"))
+
+import process_epub  # noqa: E402
+from synthetic_epub import make_issue  # noqa: E402
+
+OPF = "http://www.idpf.org/2007/opf"
+DC = "http://purl.org/dc/elements/1.1/"
+
+
+def test_process_in_place(tmp_path):
+    book = make_issue(tmp_path / "Bloomberg_2026-02-15.epub", articles=12, images=4)
+
+    process_epub.process_epub(str(book), str(book), use_cache=False)
+
+    with zipfile.ZipFile(book) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist()[0] == "mimetype"
+        assert any(name.endswith(".opf") for name in zf.namelist())
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_opf_attributes_keep_namespace(tmp_path):
+    book = make_issue(tmp_path / "issue.epub", articles=4, images=0)
+    output = tmp_path / "out.epub"
+
+    process_epub.process_epub(str(book), str(output), use_cache=False)
+
+    with zipfile.ZipFile(output) as zf:
+        root = ET.fromstring(zf.read("content.opf"))
+    creator = root.find(f".//{{{DC}}}creator")
+    identifier = root.find(f".//{{{DC}}}identifier")
+    assert creator.get(f"{{{OPF}}}role") == "aut"
+    assert creator.get(f"{{{OPF}}}file-as") == "Bloomberg"
+    assert identifier.get(f"{{{OPF}}}scheme") == "uuid"
+    assert "role" not in creator.attrib and "scheme" not in identifier.attrib
+
+
+def test_cache_key_covers_content_and_timestamp(tmp_path, monkeypatch):
+    book = make_issue(tmp_path / "issue.epub", articles=4, images=0)
+    renamed = tmp_path / "Bloomberg_2026-02-15.epub"
+    renamed.write_bytes(book.read_bytes())
+
+    key = process_epub.compute_cache_key(book)
+    assert process_epub.compute_cache_key(renamed) == key
+
+    monkeypatch.setattr(process_epub, "ZIP_DATE_TIME", (2026, 2, 15, 0, 0, 0))
+    assert process_epub.compute_cache_key(book) != key
+
+
+def test_nav_keeps_document_transforms(tmp_path):
+    book = make_issue(tmp_path / "issue.epub", articles=4, images=0)
+    title = "Bloomberg Technology: The Very Long Headline That Needs Shortening Today"
+    with zipfile.ZipFile(book, "a") as zf:
+        zf.writestr("nav.xhtml", f'<html><body><img src="logo.png"/><nav><a href="a.html">{title}</a></nav></body></html>')
+    output = tmp_path / "out.epub"
+
+    process_epub.process_epub(str(book), str(output), use_cache=False)
+
+    with zipfile.ZipFile(output) as zf:
+        nav = zf.read("nav.xhtml").decode("utf-8")
+    assert "<img" not in nav
+    assert title not in nav
+
+
+def test_copy_without_zipfile_internals(tmp_path, monkeypatch):
+    book = make_issue(tmp_path / "issue.epub", articles=4, images=2)
+    raw = tmp_path / "raw.epub"
+    fallback = tmp_path / "fallback.epub"
+
+    process_epub.process_epub(str(book), str(raw), use_cache=False)
+    monkeypatch.setattr(process_epub, "raw_copy_supported", lambda zf: False)
+    process_epub.process_epub(str(book), str(fallback), use_cache=False)
+
+    with zipfile.ZipFile(raw) as expected, zipfile.ZipFile(fallback) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == expected.namelist()
+        assert all(zf.read(name) == expected.read(name) for name in zf.namelist())
+
+
+def record_in(cache_dir, status):
+    """Record one cache event from a worker process."""
+    process_epub.CACHE_DIR = cache_dir
+    return process_epub.record_cache_event(status)
+
+
+def test_cache_stats_count_every_parallel_event(tmp_path):
+    events = ["hit", "miss"] * 40
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record_in, [tmp_path] * len(events), events))
+
+    stats = json.loads((tmp_path / "stats.json").read_text(encoding="utf-8"))
+    assert stats == {"hits": 40, "misses": 40}
@@ -0,0 +1,87 @@
+"""Tests for the recipe's cross-day dedup (simhash, DeliveredIndex, apply_repeats)."""
+
+import json
+
+
+class Fetch:
+    """Stands in for the recipe instance: serves story bodies from a dict."""
+
+    def __init__(self, bodies, delivered):
+        self.bodies = bodies
+        self.delivered = delivered
+        self.repeats = "skip"
+
+    def fetched(self, url):
+        story_id = url.rsplit("/", 1)[-1]
+        if story_id not in self.bodies:
+            raise OSError(f"HTTP 404 for {url}")
+        return json.dumps({"html": self.bodies[story_id]})
+
+    def log(self, message):
+        pass
+
+
+def article(story_id):
+    return {"url": f"https://www.bloomberg.com/news/articles/{story_id}", "title": story_id, "description": ""}
+
+
+def long_body(seed):
+    return "<p>" + " ".join(f"{seed}word{i}" for i in range(40)) + "</p>"
+
+
+def test_short_bodies_have_no_fingerprint(recipe):
+    assert recipe["simhash"]("") is None
+    assert recipe["simhash"]('<div class="chart"></div><br><img src="x.jpg">') is None
+    assert recipe["simhash"](long_body("a")) is not None
+
+
+def test_empty_bodies_fall_back_to_story_id(recipe, tmp_path):
+    index_file = str(tmp_path / "delivered.json")
+    bodies = {"OLD1": "", "OLD2": long_body("a"), "NEW1": "<div></div>", "NEW2": long_body("a")}
+
+    yesterday = recipe["DeliveredIndex"](index_file, "2026-02-15")
+    recipe["apply_repeats"](Fetch(bodies, yesterday), [("Latest", [article("OLD1"), article("OLD2")])])
+    yesterday.save()
+    assert "simhash" not in yesterday.stories["OLD1"]
+
+    today = recipe["DeliveredIndex"](index_file, "2026-02-16")
+    feeds = [("Latest", [article("OLD1"), article("NEW1"), article("NEW2")])]
+    feeds, repeats = recipe["apply_repeats"](Fetch(bodies, today), feeds)
+
+    # OLD1 repeats by ID, NEW2 by body; NEW1's empty body must not match OLD1's
+    assert [a["title"] for a in feeds[0][1]] == ["NEW1"]
+    assert repeats == 2
+
+
+def test_failed_body_fetch_falls_back_to_story_id(recipe, tmp_path):
+    index_file = str(tmp_path / "delivered.json")
+    bodies = {"OLD1": long_body("a"), "NEW2": long_body("b")}
+
+    yesterday = recipe["DeliveredIndex"](index_file, "2026-02-15")
+    recipe["apply_repeats"](Fetch(bodies, yesterday), [("Latest", [article("OLD1")])])
+    yesterday.save()
+
+    # NEW1's body 404s: it is kept and recorded, and the issue still builds
+    today = recipe["DeliveredIndex"](index_file, "2026-02-16")
+    feeds = [("Latest", [article("OLD1"), article("NEW1"), article("NEW2")])]
+    feeds, repeats = recipe["apply_repeats"](Fetch(bodies, today), feeds)
+
+    assert [a["title"] for a in feeds[0][1]] == ["NEW1", "NEW2"]
+    assert repeats == 1
+    assert "simhash" not in today.stories["NEW1"]
+
+
+def test_mark_without_description(recipe, tmp_path):
+    index_file = str(tmp_path / "delivered.json")
+    bodies = {"OLD1": long_body("a")}
+
+    yesterday = recipe["DeliveredIndex"](index_file, "2026-02-15")
+    recipe["apply_repeats"](Fetch(bodies, yesterday), [("Latest", [article("OLD1")])])
+    yesterday.save()
+
+    fetch = Fetch(bodies, recipe["DeliveredIndex"](index_file, "2026-02-16"))
+    fetch.repeats = "mark"
+    repeat = dict(article("OLD1"), description=None)
+    feeds, repeats = recipe["apply_repeats"](fetch, [("Latest", [repeat])])
+
+    assert feeds[0][1][0]["description"] == "Previously delivered 2026-02-15. "
@@ -0,0 +1,56 @@
+"""Parity tests: the recipe's iterative get_contents() against the original recursive renderer."""
+
+import pytest
+
+from bench_get_contents import article, deep, live_blog, reference_get_contents
+
+ROLES = ['p', 'text', 'br', 'anchor', 'h3', 'ul', 'li', 'webview', 'blockquote', 'image', 'video',
+         'correction', 'disclaimer', '', 'ad', 'inline-newsletter', 'tabularData', 'footnote']
+
+
+def role_node(role):
+    """One node of the given role with every field its renderer reads, around a nested text run."""
+    return {
+        'role': role, 'text': 'lead ', 'html': '<div class="chart"></div>',
+        'imageURLs': {'default': 'https://assets.bwbx.io/i.jpg'}, 'caption': 'Caption', 'credit': 'Credit',
+        'parts': [{'role': 'text', 'text': 'inner'}, {'role': 'br'}, ''],
+    }
+
+
+def test_roles_cover_renderer_table(recipe):
+    assert set(recipe['ROLE_RENDERERS']) <= set(ROLES)
+
+
+@pytest.mark.parametrize('role', ROLES)
+def test_role(recipe, role):
+    node = {'role': 'body', 'parts': [role_node(role)]}
+    assert recipe['get_contents'](node) == reference_get_contents(node)
+
+
+def test_styled_text(recipe):
+    node = {'role': 'p', 'parts': [{'role': 'text', 'style': 'em', 'text': 'ignored',
+                                    'parts': [{'role': 'text', 'text': 'styled'}]}]}
+    assert recipe['get_contents'](node) == reference_get_contents(node)
+
+
+def test_empty_string(recipe):
+    assert recipe['get_contents']('') == reference_get_contents('')
+
+
+@pytest.mark.parametrize('blocks, seed', [(20, 1), (200, 2)])
+def test_article(recipe, blocks, seed):
+    payload = article(blocks, seed)
+    assert recipe['get_contents'](payload) == reference_get_contents(payload)
+
+
+@pytest.mark.parametrize('updates, seed', [(50, 3), (500, 4)])
+def test_live_blog(recipe, updates, seed):
+    payload = live_blog(updates, seed)
+    assert recipe['get_contents'](payload) == reference_get_contents(payload)
+
+
+def test_nesting_beyond_recursion_limit(recipe):
+    assert recipe['get_contents'](deep(200)) == reference_get_contents(deep(200))
+    html = recipe['get_contents'](deep(5000))
+    assert html.count('<li>') == html.count('</li>') == 2500
+    assert 'bottom' in html
@@ -0,0 +1,65 @@
+"""Tests for the recipe's on-disk API response cache."""
+
+import os
+import json
+import time
+
+STORY_URL = "https://cdn-mobapi.bloomberg.com/wssmobile/v1/stories/SYN00000001"
+
+
+class Pool:
+    """Stands in for HTTPPool: answers 304 while the ETag matches, else serves a new body."""
+
+    def __init__(self, etag, body):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers or {})
+        if headers and headers.get("If-None-Match") == self.etag:
+            return 304, {}, b""
+        return 200, {"etag": self.etag}, self.body
+
+
+def age(cache, url, seconds):
+    """Backdate an entry's fetch time and mtime."""
+    meta, body = cache.load(url)
+    meta["fetched"] -= seconds
+    with open(cache.path(url), "wb") as f:
+        f.write(json.dumps(meta).encode("utf-8") + b"\n" + body)
+    past = time.time() - seconds
+    os.utime(cache.path(url), (past, past))
+
+
+def test_story_is_fresh_briefly_then_revalidated(recipe, tmp_path):
+    cache = recipe["ResponseCache"](str(tmp_path), log=lambda message: None)
+    pool = Pool('"v1"', b'{"title": "first"}')
+    assert cache.fetch(pool, STORY_URL) == b'{"title": "first"}'
+
+    assert cache.fetch(pool, STORY_URL) == b'{"title": "first"}'
+    assert len(pool.requests) == 1
+
+    # Past the fresh window, but unchanged: one conditional request, 304
+    age(cache, STORY_URL, 15 * 60)
+    assert cache.fetch(pool, STORY_URL) == b'{"title": "first"}'
+    assert pool.requests[-1] == {"If-None-Match": '"v1"'}
+
+    # A correction the next day is picked up
+    age(cache, STORY_URL, 86400)
+    pool.etag, pool.body = '"v2"', b'{"title": "corrected"}'
+    assert cache.fetch(pool, STORY_URL) == b'{"title": "corrected"}'
+    assert cache.stats == {"fresh": 1, "revalidated": 1, "fetched": 2}
+
+
+def test_evicts_entries_past_max_age(recipe, tmp_path):
+    cache = recipe["ResponseCache"](str(tmp_path), log=lambda message: None)
+    pool = Pool('"v1"', b"{}")
+    cache.fetch(pool, STORY_URL)
+    cache.fetch(pool, STORY_URL + "2")
+    age(cache, STORY_URL, recipe["CACHE_MAX_AGE"] + 60)
+
+    cache.evict()
+
+    assert not os.path.exists(cache.path(STORY_URL))
+    assert os.path.exists(cache.path(STORY_URL + "2"))